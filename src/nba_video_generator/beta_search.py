@@ -1,65 +1,123 @@
 # Last Name
 # Home Team
 # Team Abbreviation
+import io
 import os
 import subprocess
 import time
-from datetime import datetime, timedelta
 import shutil
+from contextlib import nullcontext
 from moviepy import \
     TextClip, VideoFileClip, CompositeVideoClip, concatenate_videoclips
 from selenium import webdriver
-from nba_video_generator.src.get_pbp_beta import get_pbp
-from nba_video_generator.src.get_plays_beta import get_plays
+from nba_video_generator.src import selenium_backend, http_backend, tracing
 from nba_video_generator.src.download_plays_beta import download_plays
 from nba_video_generator.src.write_plays_beta import write_plays
+from nba_video_generator.src.schedule import game_dates
+from nba_video_generator.src.run_manifest import Manifest, job_path, files_exist
+from nba_video_generator.src.driver_pool import DriverPool
 
 
 base_url = "https://www.nba.com/games?date="
+backends = {"selenium": selenium_backend, "http": http_backend}
 
 
 def search(driver: webdriver, last_name: str, date_start: str, date_end: str, team: str,
-           ffmpeg_path: str, preset: str = "ultrafast"):
+           ffmpeg_path: str, preset: str = "ultrafast", backend: str = "selenium",
+           resume: bool = True, manifest_path: str | None = None):
+    """
+    driver may be a DriverPool, from which a session is borrowed per date.
+
+    Progress is saved to a run manifest (manifest_path, by default in
+    run_manifest.runs_dir named by the job): scraped plays per date,
+    downloaded clips, and encoded games. With resume a rerun skips them,
+    except dates from yesterday on once game_cache.recent_ttl old.
+
+    Without the clip cache, clips of each date are downloaded into
+    base_name/yyyymmdd, kept until the run finishes.
+    """
     if date_end is None:
         date_end = date_start
 
+    if manifest_path is None:
+        manifest_path = job_path("beta", {
+            "last_name": last_name, "date_start": date_start, "date_end": date_end,
+            "team": team, "preset": preset, "backend": backend
+        })
+    if not resume and os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    manifest = Manifest(manifest_path)
+
+    scraper = backends[backend]
+    session = None if backend == "selenium" else http_backend.make_session()
+
+    pool = driver
+    if not isinstance(driver, DriverPool):
+        pool = DriverPool(size=1, drivers=[driver] if driver is not None else [])
+
     time_secs = 0
     desc_txt = None
     base_name = last_name.lower()
 
-    current_date = datetime.strptime(date_start, "%Y-%m-%d")
-    end_date = datetime.strptime(date_end, "%Y-%m-%d")
-
     if date_start != date_end:
         f = open("file_list.txt", "w", encoding="utf-8")
         desc_txt = open(last_name + " " + date_start + " " + date_end + " description.txt", "w", encoding="utf-8")
         titles = []
 
-    while current_date <= end_date:
-        date = current_date.strftime("%Y-%m-%d")
-        data_is_home_team, pbp_url = get_pbp(driver, base_url, date, team)
-    
-        if pbp_url is not None:
-            title, result = get_plays(driver, pbp_url, last_name, data_is_home_team)
-
+    for date in game_dates(team, date_start, date_end):
+        plays = manifest.get("plays", date, date=date)
+        # Clips and encodes of an earlier scrape are made again.
+        scraped = plays is None
+        if scraped:
+            with _page_driver(pool, session) as page_driver:
+                client = page_driver if session is None else session
+                with tracing.span("pbp", date=date, team=team):
+                    data_is_home_team, pbp_url = scraper.get_pbp(client, base_url, date, team)
+                plays = [None, []]
+                if pbp_url is not None:
+                    with tracing.span("plays", date=date, player=last_name, url=pbp_url):
+                        plays = scraper.get_plays(client, pbp_url, last_name, data_is_home_team)
+            manifest.put("plays", date, plays)
+        title, result = plays
+
+        if title is not None:
             if len(result) > 0:
-                try:
-                    shutil.rmtree(base_name)
-                except Exception:
-                    pass
-                os.makedirs(base_name)
-
-                player_urls = download_plays(driver, base_name, result)
-
-                time_secs, desc_txt = write_plays(
-                    title, base_name, date, player_urls, ffmpeg_path, preset, time_secs, desc_txt
-                )
+                encoded = None if scraped else manifest.get("encodes", date)
+                if encoded is None or not files_exist([encoded["path"]]):
+                    os.makedirs(base_name, exist_ok=True)
+
+                    # Recorded clips are reused, so only a fresh download clears its directory.
+                    player_urls = None if scraped else manifest.get("clips", date)
+                    if player_urls is None or not files_exist([path for path, _ in player_urls]):
+                        clips_dir = os.path.join(base_name, date.replace("-", ""))
+                        shutil.rmtree(clips_dir, ignore_errors=True)
+                        os.makedirs(clips_dir)
+                        with _page_driver(pool, session) as page_driver:
+                            player_urls = download_plays(page_driver, clips_dir, result)
+                        manifest.put("clips", date, player_urls)
+
+                    # Description is kept relative to the game so it can be replayed on resume.
+                    game_txt = io.StringIO()
+                    game_secs, _ = write_plays(
+                        title, base_name, date, player_urls, ffmpeg_path, preset, 0, game_txt
+                    )
+                    encoded = {
+                        "path": os.path.abspath(title + ".mp4"),
+                        "secs": game_secs, "description": game_txt.getvalue()
+                    }
+                    manifest.put("encodes", date, encoded)
+
+                if desc_txt is None:
+                    desc_txt = open(title + " description.txt", "w+")
+                desc_txt.write(_shift_times(encoded["description"], time_secs))
+                time_secs += encoded["secs"]
 
                 if date_start != date_end:
                     f.write(f"file '{os.path.abspath(title + '.mp4')}'\n")
                     titles.append(os.path.abspath(title + '.mp4'))
 
-        current_date += timedelta(days=1)
+    if pool is not driver:
+        pool.close()
 
     try:
         shutil.rmtree(base_name)
@@ -86,22 +144,57 @@ def search(driver: webdriver, last_name: str, date_start: str, date_end: str, te
             os.remove(title)
 
 
+def _page_driver(pool: DriverPool, session):
+    """
+    Driver borrowed from pool (None for the http backend, whose
+    clip links need no browser).
+    """
+    if session is not None:
+        return nullcontext(None)
+    return pool.driver()
+
+
+def _shift_times(description: str, time_secs: float) -> str:
+    """
+    Offsets HH:MM:SS timestamps of description lines by time_secs.
+    """
+    shifted = []
+    for line in description.splitlines(keepends=True):
+        h, m, s = line[:8].split(":")
+        line_secs = int(h) * 3600 + int(m) * 60 + int(s) + time_secs
+        shifted.append(time.strftime('%H:%M:%S', time.gmtime(line_secs)) + line[8:])
+    return "".join(shifted)
+
+
 def pipeline(name_date_team: list[tuple[str, str, str]] | list[tuple[str, str, str, str]],
-             params: dict = {}):
+             params: dict = {}, headless: bool = False, driver_options: dict | None = None,
+             trace_path: str | None = None):
+    """
+    params["backend"] = "http" scrapes and downloads without a browser.
+
+    Chrome is started by driver_factory.make_driver with driver_options
+    and reused across rows, recycled by DriverPool (max_loads page loads
+    or max_rss bytes) and replaced if it crashes.
+
+    With trace_path, stages are traced to a Chrome trace file
+    and summarized when done.
+    """
 
     for i, row in enumerate(name_date_team):
         if len(row) == 3:
             name_date_team[i] = (row[0], row[1], row[1], row[2])
 
-    for last_name, date_start, date_end, team in name_date_team:
-        driver = webdriver.Chrome()
-        driver.maximize_window()
-        # driver.implicitly_wait(3)
-        params["last_name"] = last_name
-        params["date_start"] = date_start
-        params["date_end"] = date_end
-        params["team"] = team
-        params["driver"] = driver
-        search(**params)
-        driver.close()
+    pool = DriverPool(size=1, headless=headless, options=driver_options)
+    with tracing.recording(trace_path):
+        try:
+            for last_name, date_start, date_end, team in name_date_team:
+                params["last_name"] = last_name
+                params["date_start"] = date_start
+                params["date_end"] = date_end
+                params["team"] = team
+                params["driver"] = pool
+                with tracing.span("search", player=last_name, team=team):
+                    search(**params)
+        finally:
+            pool.close()
 
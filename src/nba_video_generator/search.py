@@ -4,20 +4,29 @@ Author: Ronen Huang
 
 
 import os
+import sys
+import json
 import subprocess
+import multiprocessing
 import time
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
 from textwrap import fill
 from typing import Literal
-from datetime import datetime, timedelta
+import av
 from moviepy import \
     TextClip, VideoFileClip, CompositeVideoClip, concatenate_videoclips
-from selenium import webdriver
-from nba_video_generator.src.get_box_scores import \
-    get_box_scores, get_free_throws_or_fouls
+from moviepy.config import FFMPEG_BINARY
+from nba_video_generator.src.get_box_scores import get_free_throws_or_fouls
 from nba_video_generator.src.get_player_urls import \
-    get_player_urls, get_ft_urls, get_foul_urls
-from nba_video_generator.src.get_videos import \
-    get_videos, get_ft_or_foul_videos, sort_plays
+    get_player_urls, get_ft_and_foul_urls
+from nba_video_generator.src.get_videos import get_ft_or_foul_videos
+from nba_video_generator.src import selenium_backend, http_backend, clip_cache
+from nba_video_generator.src.planner import plan_games
+from nba_video_generator.src.driver_pool import DriverPool
+from nba_video_generator.src.run_manifest import Manifest, job_path, files_exist
+from nba_video_generator.src.play import Play
+from nba_video_generator.src import stream_copy, title_cards, encode_scheduler, tracing
 
 
 # Map event to column.
@@ -28,6 +37,8 @@ stat_td = {
 }
 td_stat = {v: k for k, v in stat_td.items()}
 
+backends = {"selenium": selenium_backend, "http": http_backend}
+
 
 def generate_video(
         driver,
@@ -36,8 +47,8 @@ def generate_video(
         ThreePA: bool = False, OREB: bool = False, DREB: bool = False,
         REB: bool = False, AST: bool = True, STL: bool = True,
         BLK: bool = True, TO: bool = False, PF: bool = False,
-        include_ft: bool = False
-        ) -> dict[str, list[tuple[str, str, str]]]:
+        include_ft: bool = False, ft_source: Literal["espn", "nba"] = "espn"
+        ) -> dict[str, list[Play]]:
     """
     Specify start date and end date as Year/Month/Day
     (for example, 2025-06-22).
@@ -45,7 +56,10 @@ def generate_video(
     Indicate true if event should be included.
 
     Output is dictionary with date as key and
-    ordered list of events (url, quarter, time).
+    ordered list of events (Play with url, description, period, clock).
+
+    Free throws (include_ft) and fouls (PF) are located on ESPN by default,
+    with ft_source "nba" from the NBA play by play alone.
 
     atl - Atlanta Hawks
     bkn	- Brooklyn Nets
@@ -78,6 +92,60 @@ def generate_video(
     uta	- Utah Jazz
     was	- Washington Wizards
     """
+    team = team.lower()
+    td_vals = get_td_vals(
+        FGM, FGA, ThreePM, ThreePA, OREB, DREB, REB, AST, STL, BLK, TO, PF
+    )
+
+    return _generate_videos(
+        driver, [(player_name, team)], date_start, date_end, td_vals, include_ft,
+        ft_source=ft_source
+    )[0]
+
+
+def generate_videos(
+        driver,
+        players: list[tuple[str, str]], date_start: str, date_end: str | None,
+        FGM: bool = True, FGA: bool = False, ThreePM: bool = False,
+        ThreePA: bool = False, OREB: bool = False, DREB: bool = False,
+        REB: bool = False, AST: bool = True, STL: bool = True,
+        BLK: bool = True, TO: bool = False, PF: bool = False,
+        include_ft: bool = False, backend: Literal["selenium", "http"] = "selenium",
+        manifest: Manifest | None = None, ft_source: Literal["espn", "nba"] = "espn"
+        ) -> list[tuple[str, list[str], dict[str, list[Play]]]]:
+    """
+    Same as generate_video for several players (name, team),
+    loading the pages of a game shared by players once.
+
+    Output is list of (title, stats list, events) in order of players.
+
+    driver may be a DriverPool to scrape games in parallel.
+
+    The http backend scrapes without a browser; driver is then
+    only used for free throws and fouls from ESPN (may be None otherwise).
+
+    Games already in manifest are not scraped again.
+    """
+    players = [(player_name, team.lower()) for player_name, team in players]
+    td_vals = get_td_vals(
+        FGM, FGA, ThreePM, ThreePA, OREB, DREB, REB, AST, STL, BLK, TO, PF
+    )
+
+    return _generate_videos(
+        driver, players, date_start, date_end, td_vals, include_ft, backend, manifest,
+        ft_source
+    )
+
+
+def get_td_vals(
+        FGM: bool = True, FGA: bool = False, ThreePM: bool = False,
+        ThreePA: bool = False, OREB: bool = False, DREB: bool = False,
+        REB: bool = False, AST: bool = True, STL: bool = True,
+        BLK: bool = True, TO: bool = False, PF: bool = False
+        ) -> list[int]:
+    """
+    Maps included events to box score columns.
+    """
     if FGA:
         FGM = False
         ThreePM = False
@@ -91,7 +159,6 @@ def generate_video(
         OREB = False
         DREB = False
         REB = True
-    team = team.lower()
 
     td_vals = []
     if FGM:
@@ -119,201 +186,425 @@ def generate_video(
     if PF:
         td_vals.append(stat_td["PF"])
 
+    return td_vals
+
+
+def _generate_videos(
+        driver, players: list[tuple[str, str]], date_start: str, date_end: str | None,
+        td_vals: list[int], include_ft: bool = False, backend: str = "selenium",
+        manifest: Manifest | None = None, ft_source: str = "espn"
+        ) -> list[tuple[str, list[str], dict[str, list[Play]]]]:
     if date_end is None:
         date_end = date_start
-    date_start_copy = datetime.strptime(date_start, '%Y-%m-%d').date()
-    date_end_copy = datetime.strptime(date_end, '%Y-%m-%d').date()
-    delta = timedelta(days=1)
-
-    title = ""
-    stats_list = []
-    results = {}
-    while date_start_copy <= date_end_copy:
-        current_date = date_start_copy.strftime('%Y-%m-%d')
-        box_score = get_box_scores(driver, current_date, team)
-        if box_score:
-            title, stats, player_urls = get_player_urls(driver, player_name, box_score, td_vals)
-            stats_list.append(stats)
-            pbp_url = box_score.rsplit("/", 1)[0] + "/play-by-play?period="
+
+    pool = driver
+    if not isinstance(driver, DriverPool):
+        pool = DriverPool(size=1, drivers=[driver] if driver is not None else [])
+
+    scraper = backends[backend]
+    session = None if backend == "selenium" else http_backend.make_session()
+
+    with _scrape_client(pool, session) as client:
+        games = plan_games(client, players, date_start, date_end, scraper)
+
+    def scrape_game(pool, game):
+        key = game[0] + " " + str(game[1])
+        outputs = None if manifest is None else manifest.get("games", key, date=game[0])
+        if outputs is not None:
+            return outputs
+        with _scrape_client(pool, session) as client, \
+                tracing.span("scrape_game", date=game[0], box_score=game[1]):
+            outputs = _scrape_game(
+                pool, client, session, scraper, game, players, td_vals, include_ft,
+                ft_source
+            )
+        if manifest is not None:
+            manifest.put("games", key, outputs)
+        return outputs
+
+    titles = [""] * len(players)
+    stats_lists = [[] for _ in players]
+    results = [{} for _ in players]
+    for (current_date, _, _), outputs in zip(games, pool.map(scrape_game, games)):
+        for i, title, stats, events in outputs:
+            if title is not None:
+                titles[i] = title
+            stats_lists[i].append(stats)
+            if events:
+                results[i][current_date] = events
+
+    if pool is not driver:
+        pool.close()
+
+    return list(zip(titles, stats_lists, results))
+
+
+def _scrape_client(pool: DriverPool, session):
+    """
+    Session of http backend, otherwise a driver borrowed from pool.
+    """
+    if session is not None:
+        return nullcontext(session)
+    return pool.driver()
+
+
+def _page_driver(pool: DriverPool, client, session):
+    """
+    Driver for pages that need a browser (ESPN, free throw and foul videos).
+    """
+    if client is session:
+        return pool.driver()
+    return nullcontext(client)
+
+
+def _scrape_game(
+        pool: DriverPool, client, session, scraper, game: tuple[str, str | None, list[int]],
+        players: list[tuple[str, str]], td_vals: list[int], include_ft: bool = False,
+        ft_source: str = "espn"
+        ) -> list[tuple[int, str | None, str, list[Play]]]:
+    """
+    Scrapes one game for the players in it.
+
+    Returns list of player index, title, stats, and ordered events.
+    """
+    current_date, box_score, members = game
+    if not box_score:
+        return [(i, None, "", []) for i in members]
+
+    outputs = []
+    pages = {}
+    with tracing.span("box_score", url=box_score):
+        box_score_rows = scraper.load_box_score(
+            client, box_score, [players[i][0] for i in members], td_vals
+        )
+    pbp_url = box_score.rsplit("/", 1)[0] + "/play-by-play?period="
+    for i in members:
+        player_name, team = players[i]
+        with tracing.span("player", date=current_date, player=player_name, team=team):
+            title, stats, player_urls = get_player_urls(
+                client, player_name, box_score, td_vals, box_score_rows
+            )
             td_vid = {}
             for td_val, player_url in player_urls:
                 if td_val <= 18:
                     fg = True
                     if td_val >= 12:
                         fg = False
-                    td_vid.update(get_videos(driver, player_url, fg))
-                    if td_val <= 7 and include_ft:
-                        pbp = get_free_throws_or_fouls(driver, current_date, team)
-                        if pbp:
-                            include_two = td_val <= 4
-                            ft_urls = get_ft_urls(
-                                driver, player_name, pbp, pbp_url, include_two
-                            )
-                            td_vid.update(get_ft_or_foul_videos(driver, ft_urls))
-                else:
-                    pbp = get_free_throws_or_fouls(driver, current_date, team)
-                    if pbp:
-                        foul_urls = get_foul_urls(driver, player_name, pbp, pbp_url)
-                        td_vid.update(get_ft_or_foul_videos(driver, foul_urls))
+                    with tracing.span("videos", stat=td_stat[td_val], url=player_url):
+                        td_vid.update(scraper.get_videos(client, player_url, fg))
+            ft_vals = [td_val for td_val, _ in player_urls if td_val <= 7] if include_ft else []
+            include_fouls = any(td_val > 18 for td_val, _ in player_urls)
+            if ft_source == "nba" and (ft_vals or include_fouls):
+                with tracing.span("ft_foul_videos", source="nba"):
+                    td_vid.update(scraper.get_ft_and_foul_videos(
+                        client, pbp_url, player_name, team, bool(ft_vals),
+                        min(ft_vals, default=7) <= 4, include_fouls, pages
+                    ))
+            elif ft_vals or include_fouls:
+                with _page_driver(pool, client, session) as driver, \
+                        tracing.span("ft_foul_videos", source="espn"):
+                    td_vid.update(_espn_videos(
+                        driver, current_date, team, player_name, pbp_url, bool(ft_vals),
+                        min(ft_vals, default=7) <= 4, include_fouls, pages
+                    ))
+            events = []
             if len(td_vid) > 0:
-                results[current_date] = sort_plays(driver, pbp_url, td_vid)
-            print()
-        else:
-            stats_list.append("")
-        date_start_copy += delta
+                with tracing.span("sort_plays", plays=len(td_vid)):
+                    events = scraper.sort_plays(client, pbp_url, td_vid, pages)
+        outputs.append((i, title, stats, events))
+        print()
 
-    return title, stats_list, results
+    return outputs
 
 
+def _espn_videos(
+        driver, current_date: str, team: str, player_name: str, pbp_url: str,
+        include_ft: bool, include_two: bool, include_fouls: bool, pages: dict
+        ) -> dict[str, list[Play]]:
+    """
+    Free throw and foul videos of a player from one pass over the
+    ESPN play by play of the game (located once per game).
+    """
+    key = ("espn", team)
+    if key not in pages:
+        # Both teams share the ESPN game page.
+        pages[key] = pages.get("espn") or get_free_throws_or_fouls(driver, current_date, team)
+        if pages[key]:
+            pages["espn"] = pages[key]
+    pbp = pages[key]
+    if not pbp:
+        return {}
+
+    ft_urls, foul_urls = get_ft_and_foul_urls(
+        driver, player_name, pbp, pbp_url, include_ft, include_two, include_fouls, pages
+    )
+    return get_ft_or_foul_videos(driver, ft_urls + foul_urls)
+
+
+@tracing.traced()
 def make_video(
-    video_urls: dict[str, list[tuple[str, str, str]]],
+    video_urls: dict[str, list[Play]],
     base_name: str, fps: int = 30,
     preset: Literal["ultrafast", "veryfast", "superfast", "faster",
                     "fast", "medium", "slow", "slower", "veryslow",
                     "placebo"] = "fast",
     segment: Literal["Whole", "Game", "Quarter", "Play"] = "Whole",
-    include_caption: bool = False, stats_list: list[str] = []
-) -> None:
+    include_caption: bool = False, stats_list: list[str] = [],
+    ffmpeg_path: str | None = None, threads: int | None = None
+) -> list[str]:
     """
     base_name specifies video path.
     
     segment by Whole, Game, or Quarter
+
+    Clips are read through the local clip cache (clip_cache).
+
+    Without captions, clips sharing one encoding (at fps) are joined
+    by stream copy with ffmpeg_path instead of being re-encoded.
+
+    Title cards are rendered once into the title_cards cache.
+
+    Otherwise each game (quarter or play) is rendered as its own job
+    on a process pool (forked, Linux only, otherwise one after another)
+    within encode_scheduler.thread_budget, threads being encoder threads
+    per job, and Whole joins the games by stream copy.
+
+    Returns video paths in order (also written to base_name/segments.txt).
     """
+    ffmpeg_path = ffmpeg_path or FFMPEG_BINARY
+
     try:
         os.makedirs(base_name)
     except Exception:
         pass
 
-    if segment != "Quarter":
-        desc_txt = open(base_name + "_description.txt", "w+")
-    time_secs = 0
-
     if len(stats_list) != len(video_urls):
         stats_list = [""] * len(video_urls)
 
-    video_clips = []
-    for (date, events), stats in zip(video_urls.items(), stats_list):
-        i = 1
-        if segment == "Quarter":
-            _make_video_quarter(base_name, date, events, fps, preset, stats)
-        else:
-            stats = fill(stats, width=75)
-            txt_clip = TextClip(
-                text=date + "\n\n" + stats, font_size=36, color="white",
-                size=(1280, 720), method="caption"
-            ).with_position("center").with_duration(2)
-            video_clips.append(txt_clip)
-            time_secs += txt_clip.duration
-            for event_url, desc, _, _ in events:
-                desc_txt.write(time.strftime('%H:%M:%S', time.gmtime(time_secs)) + " - " + desc + "\n")
-                clip = VideoFileClip(event_url)
-                if include_caption:
-                    desc_clip = TextClip(
-                        text=desc, font_size=18, color="white",
-                        size=(1280, None)
-                    ).with_position("top").with_duration(clip.duration)
-                    video_clips.append(CompositeVideoClip([clip, desc_clip], use_bgclip=True))
-                    video_clips[-1].audio = clip.audio
-                else:
-                    video_clips.append(clip)
-                time_secs += clip.duration
-                if segment == "Play":
-                    if len(video_clips) == 2:
-                        video = concatenate_videoclips(video_clips)
-                    else:
-                        video = video_clips[0]
-                    video.write_videofile(
-                        base_name + "/" + base_name + "_" + date.replace("-", "") + "_play" +
-                        str(i) + ".mp4", fps=fps, preset=preset, threads=3
-                    )
-                    i += 1
-                    video_clips.clear()
-            if segment == "Game":
-                video = concatenate_videoclips(video_clips)
-                video.write_videofile(
-                    base_name + "/" + base_name + "_" + date.replace("-", "") + ".mp4",
-                    fps=fps, preset=preset, threads=3
-                )
-                video_clips.clear()
+    # Events read back from a run manifest are lists.
+    video_urls = {
+        date: [Play.of(event) for event in events] for date, events in video_urls.items()
+    }
 
-    if segment == "Whole":
-        video = concatenate_videoclips(video_clips)
-        first_date = list(video_urls.keys())[0].replace("-", "")
-        last_date = list(video_urls.keys())[-1].replace("-", "")
-        video.write_videofile(
-            base_name + "/" + base_name + "_" + first_date + "_" + last_date + ".mp4",
-            fps=fps, preset=preset, threads=3
+    if clip_cache.use_cache:
+        urls = [event.url for events in video_urls.values() for event in events]
+        local_clips = dict(zip(urls, clip_cache.get_clips(urls)))
+        video_urls = {
+            date: [event.with_url(local_clips[event.url]) for event in events]
+            for date, events in video_urls.items()
+        }
+
+    desc_txt = open(base_name + "_description.txt", "w+")
+
+    outputs = None
+    if not include_caption and segment != "Quarter":
+        paths = [event.url for events in video_urls.values() for event in events]
+        if all(os.path.isfile(path) for path in paths):
+            params, durations = stream_copy.uniform_params(paths)
+            if params is not None and round(stream_copy.fps_value(params)) == fps:
+                try:
+                    outputs = _make_video_copy(
+                        video_urls, base_name, preset, segment, stats_list,
+                        ffmpeg_path, params, durations, desc_txt
+                    )
+                except (subprocess.CalledProcessError, OSError):
+                    # Title card or join failed, so re-encode instead.
+                    desc_txt.seek(0)
+                    desc_txt.truncate()
+                    outputs = None
+
+    if outputs is None:
+        outputs = _make_video_segments(
+            video_urls, base_name, fps, preset, segment, include_caption,
+            stats_list, ffmpeg_path, threads, desc_txt
         )
-        video_clips.clear()
 
-    if segment != "Quarter":
-        desc_txt.close()
+    desc_txt.close()
 
+    with open(os.path.join(base_name, "segments.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(outputs))
 
-def _make_video_quarter(
-    base_name: str, date: str, events: list[tuple[str, str, str]],
-    fps: int = 30, preset: str = "fast", include_caption: bool = False,
-    stats: str = ""
-) -> None:
-    stats = fill(stats, width=75)
+    return outputs
 
-    desc_txt = open(base_name + "_description.txt", "w+")
+
+def _make_video_copy(
+    video_urls: dict[str, list[Play]], base_name: str,
+    preset: str, segment: str, stats_list: list[str], ffmpeg_path: str,
+    params: dict, durations: list[float], desc_txt
+) -> list[str]:
+    outputs = []
+    parts = []
     time_secs = 0
+    clip_i = 0
+    for (date, events), stats in zip(video_urls.items(), stats_list):
+        card = title_cards.get_card(
+            date + "\n\n" + fill(stats, width=75), params, ffmpeg_path, preset
+        )
+        parts.append(card)
+        time_secs += 2
+        for i, event in enumerate(events, 1):
+            desc_txt.write(time.strftime('%H:%M:%S', time.gmtime(time_secs)) + " - " + event.desc + "\n")
+            parts.append(event.url)
+            time_secs += durations[clip_i]
+            clip_i += 1
+            if segment == "Play":
+                outputs.append(stream_copy.concat_copy(
+                    parts, base_name + "/" + base_name + "_" + date.replace("-", "") +
+                    "_play" + str(i) + ".mp4", ffmpeg_path
+                ))
+                parts.clear()
+        if segment == "Game":
+            outputs.append(stream_copy.concat_copy(
+                parts, base_name + "/" + base_name + "_" + date.replace("-", "") + ".mp4",
+                ffmpeg_path
+            ))
+            parts.clear()
+
+    if segment == "Whole":
+        outputs.append(stream_copy.concat_copy(
+            parts, _whole_name(base_name, video_urls), ffmpeg_path
+        ))
 
-    video_clips = [
-        TextClip(
-            text=date + "\n\n" + stats, font_size=36, color="white",
-            size=(1280, 720), method="caption"
-        ).with_position("center").with_duration(2)
+    return [os.path.abspath(output) for output in outputs]
+
+
+def _make_video_segments(
+    video_urls: dict[str, list[Play]], base_name: str,
+    fps: int, preset: str, segment: str, include_caption: bool,
+    stats_list: list[str], ffmpeg_path: str, threads: int | None, desc_txt
+) -> list[str]:
+    # Each segment is list of clip path and description (None for title card) and output path.
+    segments = []
+    time_secs = 0
+    for (date, events), stats in zip(video_urls.items(), stats_list):
+        day = base_name + "/" + base_name + "_" + date.replace("-", "")
+        parts = [(title_cards.get_card(
+            date + "\n\n" + fill(stats, width=75), title_cards.card_params(fps),
+            ffmpeg_path, preset
+        ), None)]
+        time_secs += 2
+        current_quarter = events[0].period if len(events) > 0 else 0
+        for i, event in enumerate(events, 1):
+            if segment == "Quarter" and event.period != current_quarter:
+                segments.append((parts, day + "q" + str(current_quarter) + ".mp4"))
+                parts = []
+                current_quarter = event.period
+            desc_txt.write(time.strftime('%H:%M:%S', time.gmtime(time_secs)) + " - " + event.desc + "\n")
+            parts.append((event.url, event.desc))
+            with av.open(event.url) as container:
+                time_secs += container.duration / 1e6
+            if segment == "Play":
+                segments.append((parts, day + "_play" + str(i) + ".mp4"))
+                parts = []
+        if segment == "Quarter":
+            segments.append((parts, day + "q" + str(current_quarter) + ".mp4"))
+        elif segment != "Play":
+            segments.append((parts, day + ".mp4"))
+
+    caption_size = 28 if segment == "Quarter" else 18
+    workers, threads = encode_scheduler.plan(len(segments), threads or 2)
+    mp_context = _fork_context()
+    if mp_context is None:
+        # Spawned workers would re-import the calling script.
+        workers = 1
+    logger = "bar" if workers == 1 else None
+    jobs = [
+        (parts, output, fps, preset, threads, include_caption, caption_size, logger)
+        for parts, output in segments
     ]
-    current_quarter = events[0][2]
-    time_secs += 2
+    if workers == 1:
+        outputs = [_render_segment(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            results = list(executor.map(
+                tracing.run_remote, [tracing.enabled] * len(jobs),
+                [_render_segment] * len(jobs), *zip(*jobs)
+            ))
+        outputs = [output for output, _ in results]
+        for _, events in results:
+            tracing.merge(events)
+
+    if segment == "Whole":
+        whole = stream_copy.concat_copy(outputs, _whole_name(base_name, video_urls), ffmpeg_path)
+        for output in outputs:
+            os.remove(output)
+        outputs = [whole]
+
+    return [os.path.abspath(output) for output in outputs]
+
+
+def _fork_context():
+    """
+    Fork start method for render workers (None where fork is
+    unavailable or unsafe, Windows and macOS).
+    """
+    if sys.platform != "linux" or "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context("fork")
+
 
-    for event_url, desc, quarter, _ in events:
-        desc_txt.write(time.strftime('%H:%M:%S', time.gmtime(time_secs)) + " - " + desc + "\n")
-        video_clip = VideoFileClip(event_url)
-        if include_caption:
+def _render_segment(
+    parts: list[tuple[str, str | None]], output: str, fps: int, preset: str,
+    threads: int, include_caption: bool, caption_size: int, logger: str | None
+) -> str:
+    """
+    Encodes clips of one segment (run in a worker process).
+    """
+    with tracing.span("render_segment", output=output, clips=len(parts)):
+        return _render_clips(parts, output, fps, preset, threads, include_caption,
+                             caption_size, logger)
+
+
+def _render_clips(
+    parts: list[tuple[str, str | None]], output: str, fps: int, preset: str,
+    threads: int, include_caption: bool, caption_size: int, logger: str | None
+) -> str:
+    sources = []
+    video_clips = []
+    for event_url, desc in parts:
+        clip = VideoFileClip(event_url)
+        sources.append(clip)
+        if include_caption and desc is not None:
             desc_clip = TextClip(
-                text=desc, font_size=28, color="white",
+                text=desc, font_size=caption_size, color="white",
                 size=(1280, None)
-            ).with_position("top").with_duration(video_clip.duration)
-            clip = CompositeVideoClip([video_clip, desc_clip], use_bgclip=True)
-            clip[-1].audio = video_clip.audio
+            ).with_position("top").with_duration(clip.duration)
+            video_clips.append(CompositeVideoClip([clip, desc_clip], use_bgclip=True))
+            video_clips[-1].audio = clip.audio
         else:
-            clip = video_clip
-        time_secs += clip.duration
-        if quarter == current_quarter:
             video_clips.append(clip)
-        else:
-            video = concatenate_videoclips(video_clips)
-            video_name = base_name + "/" + base_name + "_" + date.replace("-", "") + \
-                "q" + current_quarter + ".mp4"
-            video.write_videofile(video_name, fps=fps, preset=preset, threads=3)
-            video_clips = [clip]
-            current_quarter = quarter
 
     video = concatenate_videoclips(video_clips)
-    video_name = base_name + "/" + base_name + "_" + date.replace("-", "") + \
-        "q" + current_quarter + ".mp4"
-    video.write_videofile(video_name, fps=fps, preset=preset, threads=3)
+    video.write_videofile(output, fps=fps, preset=preset, threads=threads, logger=logger)
 
-    desc_txt.close()
+    for clip in sources:
+        clip.close()
 
+    return output
 
-def combine_videos(base_name: str, ffmpeg_path: str, title: str) -> None:
 
-    files = [
-        os.path.join(os.path.abspath(base_name), f)
-        for f in os.listdir(base_name)
-        if f.lower().endswith(".mp4")
-    ]
+def _whole_name(base_name: str, video_urls: dict) -> str:
+    first_date = list(video_urls.keys())[0].replace("-", "")
+    last_date = list(video_urls.keys())[-1].replace("-", "")
+    return base_name + "/" + base_name + "_" + first_date + "_" + last_date + ".mp4"
+
 
-    files.sort(key=os.path.getctime)
+@tracing.traced()
+def combine_videos(base_name: str, ffmpeg_path: str, title: str,
+                   files: list[str] | None = None) -> None:
+    """
+    Joins files in order, by default the segments.txt manifest
+    written by make_video.
+    """
+    if files is None:
+        with open(os.path.join(base_name, "segments.txt"), encoding="utf-8") as f:
+            files = f.read().splitlines()
 
     list_path = os.path.join(base_name, "file_list.txt")
     with open(list_path, "w", encoding="utf-8") as f:
         for file_path in files:
             safe_path = file_path.replace("\\", "/")
+            safe_path = safe_path.replace("'", r"'\''")
             f.write(f"file '{safe_path}'\n")
 
     output_path = title + ".mp4"
@@ -327,28 +618,88 @@ def combine_videos(base_name: str, ffmpeg_path: str, title: str) -> None:
     ])
 
 
+# Parameters of generate_videos naming a scrape job (run manifest key).
+scrape_keys = (
+    "players", "date_start", "date_end", "FGM", "FGA", "ThreePM", "ThreePA", "OREB",
+    "DREB", "REB", "AST", "STL", "BLK", "TO", "PF", "include_ft", "backend", "ft_source",
+)
+
+
 def pipeline(player_params: dict = {}, video_params: dict = {},
-             name_team_base: list[tuple[str, str, str]] = []):
+             name_team_base: list[tuple[str, str, str]] = [],
+             backend: Literal["selenium", "http"] = "selenium",
+             workers: int | None = None, headless: bool = False,
+             resume: bool = True, manifest_path: str | None = None,
+             driver_options: dict | None = None, trace_path: str | None = None):
+    """
+    backend "http" scrapes without a browser, only starting Chrome
+    for free throws (include_ft) and fouls (PF) from ESPN
+    (not with player_params ft_source "nba").
+
+    Games are scraped by up to workers Chrome sessions
+    (by default about one per two cores), started with
+    driver_factory.make_driver options driver_options.
+
+    Progress is saved to a run manifest (manifest_path, by default in
+    run_manifest.runs_dir named by the job), so with resume a rerun skips
+    scraped games and finished videos. Once scraping is done, videos
+    are rendered from the manifest without scraping. Games from
+    yesterday on are scraped again once game_cache.recent_ttl old.
+
+    With trace_path, stages are traced to a Chrome trace file
+    and summarized when done.
+    """
     try:
         player_params["date_start"]
     except Exception:
         raise Exception("Start Date not provided.")
 
+    # Copies, the caller's dicts are left as given.
+    player_params = dict(player_params)
+    video_params = dict(video_params)
+
     if "date_end" not in player_params:
         player_params["date_end"] = player_params["date_start"]
 
-    driver = webdriver.Chrome()
-    driver.implicitly_wait(5)
-
-    for player_info in name_team_base:
-        name, team, base = player_info
-        player_params["player_name"] = name
-        player_params["team"] = team
-        video_params["base_name"] = base
-        player_params["driver"] = driver
-        title, stats_list, video_params["video_urls"] = generate_video(**player_params)
-        video_params["stats_list"] = stats_list
-        make_video(**video_params)
-        combine_videos(video_params["base_name"], video_params["ffmpeg_path"], title)
-
-    driver.quit()
+    player_params["players"] = [(name, team) for name, team, _ in name_team_base]
+    player_params["backend"] = backend
+
+    if manifest_path is None:
+        manifest_path = job_path(
+            "search", {k: player_params[k] for k in scrape_keys if k in player_params}
+        )
+    if not resume and os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    manifest = Manifest(manifest_path)
+
+    with tracing.recording(trace_path):
+        date_end = player_params["date_end"]
+        outputs = manifest.get("scrape", "outputs", date=date_end)
+        # Videos of an earlier scrape are rendered again.
+        scraped = outputs is None
+        if scraped:
+            pool = DriverPool(size=workers, headless=headless, options=driver_options)
+            player_params["driver"] = pool
+            player_params["manifest"] = manifest
+            try:
+                with tracing.span("scrape", players=len(name_team_base)):
+                    outputs = generate_videos(**player_params)
+            finally:
+                pool.close()
+            manifest.put("scrape", "outputs", outputs)
+
+        for (_, _, base), (title, stats_list, video_urls) in zip(name_team_base, outputs):
+            video_params["base_name"] = base
+            video_params["video_urls"] = video_urls
+            video_params["stats_list"] = stats_list
+            # Video settings are part of the key so changing them renders again.
+            key = json.dumps(
+                {k: v for k, v in video_params.items() if k not in ("video_urls", "stats_list")},
+                sort_keys=True
+            )
+            with tracing.span("render", base_name=base):
+                files = None if scraped else manifest.get("videos", key)
+                if not files_exist(files):
+                    files = make_video(**video_params)
+                    manifest.put("videos", key, files)
+                combine_videos(video_params["base_name"], video_params["ffmpeg_path"], title, files)
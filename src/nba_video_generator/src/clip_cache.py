@@ -0,0 +1,198 @@
+import os
+import sqlite3
+import hashlib
+import time
+from contextlib import closing, contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import requests
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+from nba_video_generator.src.http_backend import make_session
+from nba_video_generator.src.download_clips import download_clip
+
+
+cache_dir = os.path.join(os.path.expanduser("~"), ".nba_video_generator", "clips")
+max_bytes = 20 * 1024 ** 3
+use_cache = True
+# Clips used this recently are never evicted (another run may be reading them).
+recent_secs = 6 * 3600
+# Partial downloads untouched this long are removed by evict.
+stale_secs = 24 * 3600
+
+
+def _connect() -> sqlite3.Connection:
+    os.makedirs(cache_dir, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), timeout=30)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS clips ("
+        "url TEXT PRIMARY KEY, sha256 TEXT, size INTEGER, last_used REAL)"
+    )
+    return conn
+
+
+def _clip_path(sha256: str) -> str:
+    return os.path.join(cache_dir, sha256[:2], sha256 + ".mp4")
+
+
+def is_cached_path(path: str) -> bool:
+    """
+    Whether path is a file of the clip cache (which must not be removed).
+    """
+    return os.path.abspath(path).startswith(os.path.abspath(cache_dir) + os.sep)
+
+
+def get_clip(url: str, session: requests.Session | None = None) -> str:
+    """
+    Returns local path of clip, downloading it into the cache if missing.
+    """
+    with closing(_connect()) as conn:
+        row = conn.execute(
+            "SELECT sha256, size FROM clips WHERE url = ?", (url,)
+        ).fetchone()
+        if row is not None:
+            path = _clip_path(row[0])
+            if os.path.exists(path) and os.path.getsize(path) == row[1]:
+                with conn:
+                    conn.execute(
+                        "UPDATE clips SET last_used = ? WHERE url = ?", (time.time(), url)
+                    )
+                return path
+
+    with _url_lock(url):
+        return _download(url, session)
+
+
+@contextmanager
+def _url_lock(url: str):
+    """
+    Holds an OS file lock on url's download, so threads, forked
+    workers and other runs share one partial file.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(_temp_path(url) + ".lock", "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _temp_path(url: str) -> str:
+    """
+    Download path of url, the same on every run so partial
+    downloads (.tmp.part) are resumed.
+    """
+    return os.path.join(cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".tmp")
+
+
+def _download(url: str, session: requests.Session | None) -> str:
+    with closing(_connect()) as conn:
+        row = conn.execute(
+            "SELECT sha256, size FROM clips WHERE url = ?", (url,)
+        ).fetchone()
+    # Downloaded by another thread or process while waiting for the lock.
+    if row is not None and os.path.exists(_clip_path(row[0])) and \
+            os.path.getsize(_clip_path(row[0])) == row[1]:
+        return _clip_path(row[0])
+
+    if session is None:
+        session = make_session()
+
+    temp_path = _temp_path(url)
+    download_clip(session, url, temp_path)
+
+    digest = hashlib.sha256()
+    with open(temp_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    sha256 = digest.hexdigest()
+    size = os.path.getsize(temp_path)
+
+    path = _clip_path(sha256)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(temp_path, path)
+
+    with closing(_connect()) as conn:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO clips VALUES (?, ?, ?, ?)",
+                (url, sha256, size, time.time())
+            )
+
+    return path
+
+
+def get_clips(urls: list[str], workers: int = 8,
+              session: requests.Session | None = None) -> list[str]:
+    """
+    Returns local paths of clips in order of urls, downloading
+    missing clips concurrently, then evicts least recently used clips
+    over max_bytes.
+    """
+    if session is None:
+        session = make_session(workers)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        paths = list(executor.map(lambda url: get_clip(url, session), urls))
+
+    evict(keep={os.path.basename(path)[:-4] for path in paths})
+    return paths
+
+
+def evict(keep: set[str] = set()) -> None:
+    """
+    Removes least recently used clips until the cache is within max_bytes,
+    except clips whose sha256 is in keep or used within recent_secs,
+    and partial downloads untouched for stale_secs.
+    """
+    now = time.time()
+    with closing(_connect()) as conn:
+        _sweep_partials(now)
+        clips = conn.execute(
+            "SELECT sha256, MAX(size), MAX(last_used) FROM clips "
+            "GROUP BY sha256 ORDER BY MAX(last_used)"
+        ).fetchall()
+        total = sum(size for _, size, _ in clips)
+
+        for sha256, size, last_used in clips:
+            if total <= max_bytes:
+                break
+            if sha256 in keep or last_used > now - recent_secs:
+                continue
+            try:
+                os.remove(_clip_path(sha256))
+            except FileNotFoundError:
+                pass
+            with conn:
+                conn.execute("DELETE FROM clips WHERE sha256 = ?", (sha256,))
+            total -= size
+
+
+def _sweep_partials(now: float) -> None:
+    """
+    Removes partial downloads and locks (.tmp, .tmp.part, .tmp.lock) untouched for stale_secs.
+    """
+    for entry in os.scandir(cache_dir):
+        if ".tmp" not in entry.name or not entry.is_file():
+            continue
+        try:
+            if entry.stat().st_mtime < now - stale_secs:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,91 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from nba_video_generator.src import fetch_policy, tracing
+from nba_video_generator.src.http_backend import make_session
+
+
+chunk_size = 1 << 20
+timeout = 60
+max_attempts = 4
+
+
+def download_clip(session: requests.Session, url: str, path: str) -> str:
+    """
+    Streams clip to path, resuming a partial download (path.part)
+    with a range request and verifying its size.
+
+    Returns path.
+    """
+    with tracing.span("download_clip", url=url, path=path):
+        part_path = path + ".part"
+
+        for attempt in range(max_attempts):
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            request_headers = {"Range": "bytes=" + str(offset) + "-"} if offset else {}
+            try:
+                with session.get(url, stream=True, headers=request_headers, timeout=timeout) as response:
+                    if response.status_code == 416:
+                        # Partial file is already complete (or larger than the clip).
+                        expected = _remote_size(session, url)
+                        if expected is not None and expected == offset:
+                            os.replace(part_path, path)
+                            return path
+                        os.remove(part_path)
+                        continue
+                    response.raise_for_status()
+
+                    if response.status_code == 206:
+                        expected = _total_size(response.headers.get("Content-Range", ""))
+                        mode = "ab"
+                    else:
+                        # Range ignored, start over.
+                        offset = 0
+                        length = response.headers.get("Content-Length")
+                        expected = int(length) if length else None
+                        mode = "wb"
+
+                    with open(part_path, mode) as f:
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            f.write(chunk)
+            except (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError):
+                # Dropped mid-clip, the partial file is resumed.
+                time.sleep(fetch_policy.backoff(attempt))
+                continue
+
+            size = os.path.getsize(part_path)
+            if expected is None or size == expected:
+                os.replace(part_path, path)
+                return path
+
+        raise Exception("Could not download " + url + " to " + path)
+
+
+def download_clips(urls_paths: list[tuple[str, str]], workers: int = 8,
+                   session: requests.Session | None = None) -> list[str]:
+    """
+    Downloads (url, path) clips concurrently.
+
+    Returns paths in order of urls_paths.
+    """
+    if session is None:
+        session = make_session(workers)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return list(executor.map(
+            lambda url_path: download_clip(session, *url_path), urls_paths
+        ))
+
+
+def _total_size(content_range: str) -> int | None:
+    match = re.match(r"bytes \d+-\d+/(\d+)", content_range)
+    return int(match.group(1)) if match else None
+
+
+def _remote_size(session: requests.Session, url: str) -> int | None:
+    response = session.head(url, allow_redirects=True, timeout=timeout)
+    length = response.headers.get("Content-Length")
+    return int(length) if length else None
@@ -1,59 +1,66 @@
 import os
-import time
-import pyautogui
-import pyperclip
+from urllib.parse import urlparse
 from selenium import webdriver
-from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from nba_video_generator.src import clip_cache, fetch_policy, page_ready, tracing
+from nba_video_generator.src.download_clips import download_clips
+from nba_video_generator.src.get_videos import video_markers
 
 
-def download_plays(driver: webdriver, base_name: str, result: list):
-    i = 0
-    player_urls = []
-    for video_url, desc_raw, _, _ in result:
-        driver.get(video_url)
+@tracing.traced()
+def download_plays(driver: webdriver, base_name: str, result: list, workers: int = 8):
+    """
+    Finds the clip of each play and downloads the clips
+    concurrently into the clip cache (or base_name if disabled).
 
-        body = driver.find_element(By.TAG_NAME, "body").text.lower()
+    Returns list of clip path and description in order of plays.
+    """
+    first_page = True
+    clips = []
+    for video_url, desc_raw, _, _ in result:
+        if urlparse(video_url).path.endswith(".mp4"):
+            # Clip link (http backend), no video page to open.
+            clips.append((video_url, desc_raw))
+            continue
 
-        while "content unavailable" in body or \
-                "no video available" in body:
-            driver.refresh()
-            body = driver.find_element(By.TAG_NAME, "body").text.lower()
+        try:
+            fetch_policy.load(driver, video_url, video_markers, page_ready.video_page)
+        except fetch_policy.FetchError as e:
+            print(e)
+            continue
 
-        if i == 0:
+        if first_page:
             try:
                 driver.find_element(By.CSS_SELECTOR, 'button[aria-label="Close"]').click()
             except:
                 pass
-
-        # video_path = os.path.join(os.path.abspath(base_name), str(i) + ".mp4") if i == 0 else str(i)
+            first_page = False
 
         video = WebDriverWait(driver, 3).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "video.vjs-tech"))
         )
         driver.execute_script("arguments[0].pause();", video)
         src = video.get_attribute("src")
-        
-        try:   
+
+        try:
             driver.find_element(By.CSS_SELECTOR, 'button[data-click="close"]').click()
         except Exception:
             pass
 
         if not src.endswith("missing.mp4"):
-            ActionChains(driver).pause(2).move_to_element(video).context_click(video).perform()
-            time.sleep(1)
-            pyautogui.typewrite(['down', 'down', 'down', 'down', 'down', 'enter']) 
-            time.sleep(3)
-            pyautogui.hotkey('ctrl', 'c')
-            clip_name = pyperclip.paste()
-            if i == 0:
-                time.sleep(2)
-                pyautogui.write(os.path.join(os.path.abspath(base_name), clip_name + ".mp4"), interval=0.10)
-            pyautogui.press('enter')
-            player_urls.append((os.path.join(os.path.abspath(base_name), clip_name + ".mp4"), desc_raw))
-            i += 1
-            time.sleep(3)
-
-    return player_urls
+            clips.append((src, desc_raw))
+
+    if clip_cache.use_cache:
+        paths = clip_cache.get_clips([src for src, _ in clips], workers)
+    else:
+        paths = download_clips(
+            [
+                (src, os.path.join(os.path.abspath(base_name), str(i) + ".mp4"))
+                for i, (src, _) in enumerate(clips)
+            ],
+            workers
+        )
+
+    return [(path, desc_raw) for path, (_, desc_raw) in zip(paths, clips)]
@@ -0,0 +1,75 @@
+import os
+from selenium import webdriver
+
+
+# URL patterns blocked through CDP, by kind.
+blocked_urls = {
+    "images": [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.otf"
+    ],
+    # The player keeps its src attribute, which is all that is read from video pages.
+    "media": ["*.mp4", "*.m3u8", "*.m4s", "*.webm", "*.mp3", "*.aac"],
+    "trackers": [
+        "*doubleclick.net*", "*googlesyndication.com*", "*googletagmanager.com*",
+        "*google-analytics.com*", "*amazon-adsystem.com*", "*adsrvr.org*",
+        "*scorecardresearch.com*", "*facebook.net*", "*omtrdc.net*", "*demdex.net*",
+        "*chartbeat.com*", "*taboola.com*", "*outbrain.com*", "*branch.io*"
+    ],
+}
+
+profile_root = os.path.join(os.path.expanduser("~"), ".nba_video_generator", "profiles")
+
+
+def make_driver(
+    headless: bool = False, implicit_wait: float = 0, eager: bool = True,
+    block: tuple[str, ...] = ("images", "media", "trackers"),
+    profile_dir: str | None = None, window_size: tuple[int, int] | None = (1920, 1080),
+    arguments: tuple[str, ...] = ()
+) -> webdriver.Chrome:
+    """
+    Chrome session for scraping.
+
+    eager returns from page loads once the DOM is parsed (pages
+    are awaited with page_ready). block lists kinds of blocked_urls.
+    profile_dir (name under profile_root or a path) keeps cookies and
+    cache between runs; a profile can only be used by one session at a time.
+    window_size None maximizes the window. arguments are further
+    Chrome command line switches.
+    """
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+    if eager:
+        options.page_load_strategy = "eager"
+    if "images" in block:
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+    if "media" in block:
+        options.add_argument("--autoplay-policy=user-gesture-required")
+    if profile_dir is not None:
+        options.add_argument(
+            "--user-data-dir=" + os.path.join(profile_root, os.path.expanduser(profile_dir))
+        )
+    if window_size is not None:
+        options.add_argument("--window-size=" + str(window_size[0]) + "," + str(window_size[1]))
+    options.add_argument("--disable-extensions")
+    options.add_argument("--mute-audio")
+    for argument in arguments:
+        options.add_argument(argument)
+
+    driver = webdriver.Chrome(options=options)
+    driver.implicitly_wait(implicit_wait)
+
+    urls = [url for kind in block for url in blocked_urls[kind]]
+    if urls:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+
+    if window_size is None and not headless:
+        driver.maximize_window()
+
+    return driver
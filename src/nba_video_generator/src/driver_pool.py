@@ -0,0 +1,231 @@
+import os
+import queue
+import threading
+import weakref
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from nba_video_generator.src.driver_factory import make_driver
+
+
+# Page loads per driver, counted by fetch_policy.load.
+_page_loads = weakref.WeakKeyDictionary()
+
+
+def default_size() -> int:
+    """
+    Number of Chrome sessions to run, about one per two cores (at most 8).
+    """
+    return max(1, min(8, (os.cpu_count() or 2) // 2))
+
+
+def count_load(driver) -> None:
+    try:
+        _page_loads[driver] = _page_loads.get(driver, 0) + 1
+    except TypeError:
+        pass
+
+
+def page_loads(driver) -> int:
+    try:
+        return _page_loads.get(driver, 0)
+    except TypeError:
+        return 0
+
+
+def session_rss(driver) -> int | None:
+    """
+    Resident memory in bytes of the browser processes of driver
+    (chromedriver and its descendants), None if unknown (not Linux).
+    """
+    try:
+        root = driver.service.process.pid
+    except AttributeError:
+        return None
+    if not os.path.isdir("/proc"):
+        return None
+
+    children = {}
+    rss = {}
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open("/proc/" + pid + "/status") as f:
+                status = dict(line.split(":", 1) for line in f if ":" in line)
+        except OSError:
+            continue
+        children.setdefault(int(status["PPid"]), []).append(int(pid))
+        rss[int(pid)] = int(status.get("VmRSS", "0 kB").split()[0]) * 1024
+
+    total = 0
+    stack = [root]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total
+
+
+def is_healthy(driver) -> bool:
+    try:
+        driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+class DriverPool:
+    """
+    Bounded pool of WebDriver sessions, started when first needed.
+
+    options are passed to driver_factory.make_driver; each session
+    gets its own subdirectory of profile_dir.
+
+    Sessions the pool started are replaced after max_loads page loads
+    or above max_rss bytes, and any session that stops responding
+    is dropped and replaced when next needed.
+    """
+
+    def __init__(self, size: int | None = None, headless: bool = False,
+                 implicit_wait: float = 0, drivers: list | None = None,
+                 options: dict | None = None, max_loads: int | None = 300,
+                 max_rss: int | None = 2 * 1024 ** 3):
+        self.drivers = list(drivers or [])
+        self._started = []
+        self.size = max(size or default_size(), len(self.drivers))
+        self.headless = headless
+        self.implicit_wait = implicit_wait
+        self.options = dict(options or {})
+        self.max_loads = max_loads
+        self.max_rss = max_rss
+        self.recycled = 0
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._count = len(self.drivers)
+        # Profile slot of each started session, reused by its replacement.
+        self._slots = {}
+        self._free_slots = []
+        # Whether a driver borrowed by this thread was dropped as crashed.
+        self._local = threading.local()
+        for driver in self.drivers:
+            self._idle.put(driver)
+
+    @contextmanager
+    def driver(self):
+        """
+        Borrows a driver, starting a new session if none is idle
+        and the pool is not full.
+        """
+        driver = self._acquire()
+        try:
+            yield driver
+        finally:
+            if is_healthy(driver):
+                self._idle.put(driver)
+            else:
+                self._local.crashed = True
+                self._discard(driver)
+
+    def _acquire(self):
+        while True:
+            with self._lock:
+                start = self._idle.empty() and self._count < self.size
+                if start:
+                    self._count += 1
+                    slot = self._free_slots.pop() if self._free_slots else len(self._slots) + 1
+            if start:
+                return self._start(slot)
+
+            driver = self._idle.get()
+            if not is_healthy(driver) or self._worn(driver):
+                self._discard(driver)
+                continue
+            return driver
+
+    def _start(self, slot: int):
+        options = dict(self.options)
+        if options.get("profile_dir") is not None:
+            options["profile_dir"] = os.path.join(options["profile_dir"], str(slot))
+        try:
+            driver = make_driver(self.headless, self.implicit_wait, **options)
+        except Exception:
+            with self._lock:
+                self._count -= 1
+                self._free_slots.append(slot)
+            raise
+        with self._lock:
+            self.drivers.append(driver)
+            self._started.append(driver)
+            self._slots[id(driver)] = slot
+        return driver
+
+    def _worn(self, driver) -> bool:
+        if driver not in self._started:
+            return False
+        if self.max_loads is not None and page_loads(driver) >= self.max_loads:
+            return True
+        if self.max_rss is not None:
+            rss = session_rss(driver)
+            return rss is not None and rss > self.max_rss
+        return False
+
+    def _discard(self, driver) -> None:
+        """
+        Removes driver from the pool, quitting it if the pool started it.
+        """
+        with self._lock:
+            self._count -= 1
+            self.drivers.remove(driver)
+            started = driver in self._started
+            if started:
+                self._started.remove(driver)
+                self._free_slots.append(self._slots.pop(id(driver)))
+                self.recycled += 1
+        if started:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def map(self, fn: Callable, tasks: list) -> list:
+        """
+        Runs fn(pool, task) for each task on up to size threads.
+
+        A task failing after its session crashed is retried once
+        on a fresh session.
+
+        Returns results in order of tasks; the first exception is raised.
+        """
+        if self.size == 1 or len(tasks) <= 1:
+            return [self._run(fn, task) for task in tasks]
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(lambda task: self._run(fn, task), tasks))
+
+    def _run(self, fn: Callable, task):
+        self._local.crashed = False
+        try:
+            return fn(self, task)
+        except Exception:
+            if not self._local.crashed:
+                raise
+        self._local.crashed = False
+        return fn(self, task)
+
+    def close(self) -> None:
+        """
+        Quits the sessions the pool started.
+        """
+        for driver in self._started:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            self.drivers.remove(driver)
+        self._started.clear()
+        self._slots.clear()
+        self._free_slots.clear()
+        self._count = len(self.drivers)
+        self._idle = queue.Queue()
+        for driver in self.drivers:
+            self._idle.put(driver)
@@ -0,0 +1,68 @@
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from nba_video_generator.src import tracing
+
+
+# Total encoder threads for all concurrent ffmpeg jobs (None for all cores).
+thread_budget = None
+
+
+def total_threads() -> int:
+    return thread_budget or os.cpu_count() or 2
+
+
+def plan(jobs: int, threads_per_job: int = 2) -> tuple[int, int]:
+    """
+    Returns number of concurrent jobs and threads per job
+    so that jobs x threads stays within the thread budget.
+    """
+    budget = total_threads()
+    threads_per_job = max(1, min(threads_per_job, budget))
+    workers = max(1, min(jobs, budget // threads_per_job))
+    if workers == jobs:
+        # Fewer jobs than the budget allows, give them the spare threads.
+        threads_per_job = max(threads_per_job, budget // max(1, jobs))
+    return workers, threads_per_job
+
+
+class EncodeError(Exception):
+    """
+    Raised after all jobs finish if any failed.
+
+    failures is list of job index, command, and ffmpeg error output.
+    """
+
+    def __init__(self, failures: list[tuple[int, list[str], str]]):
+        self.failures = failures
+        super().__init__(
+            "\n".join(
+                "job " + str(i) + " failed: " + " ".join(command) + "\n" + stderr[-500:]
+                for i, command, stderr in failures
+            )
+        )
+
+
+def run(commands: list[list[str]], threads_per_job: int = 2) -> None:
+    """
+    Runs ffmpeg commands concurrently within the thread budget,
+    appending -threads to each command before its output path.
+    """
+    workers, threads = plan(len(commands), threads_per_job)
+
+    def run_job(command):
+        command = command[:-1] + ["-threads", str(threads), command[-1]]
+        with tracing.span("encode", output=command[-1], threads=threads):
+            return subprocess.run(command, capture_output=True, text=True, errors="replace")
+
+    # Each job is an ffmpeg process, the threads only wait on them.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run_job, commands))
+
+    failures = [
+        (i, command, result.stderr)
+        for i, (command, result) in enumerate(zip(commands, results))
+        if result.returncode != 0
+    ]
+    if failures:
+        raise EncodeError(failures)
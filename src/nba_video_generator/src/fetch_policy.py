@@ -0,0 +1,151 @@
+"""
+Shared retry and rate limit policy for page loads.
+
+Pages showing an unavailable marker are reloaded with jittered
+exponential backoff, up to max_attempts or deadline seconds,
+and requests to each host are spaced by a token bucket.
+"""
+import time
+import random
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+import requests
+from selenium import webdriver
+from nba_video_generator.src import page_ready, driver_pool, tracing
+
+
+max_attempts = 6
+deadline = 300
+base_delay = 2.0
+max_delay = 60.0
+
+# Host (or parent domain) to requests per second and burst.
+host_rates = {
+    "www.nba.com": (3.0, 6),
+    "stats.nba.com": (3.0, 6),
+    "espn.com": (2.0, 4),
+}
+
+unavailable_markers = ("content unavailable",)
+retry_statuses = {429, 500, 502, 503, 504}
+
+# Number of retries per host.
+retries = Counter()
+
+_buckets = {}
+_lock = threading.Lock()
+
+
+class FetchError(Exception):
+    """
+    Raised when a page is still unavailable after max_attempts or deadline.
+    """
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Takes a token, sleeping until one is available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+def host_of(url: str) -> str:
+    """
+    Key of url in host_rates (netloc if not limited).
+    """
+    netloc = urlparse(url).netloc.lower()
+    for host in host_rates:
+        if netloc == host or netloc.endswith("." + host):
+            return host
+    return netloc
+
+
+def throttle(url: str) -> None:
+    """
+    Waits for the rate limit of the host of url.
+    """
+    host = host_of(url)
+    if host not in host_rates:
+        return
+    with _lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(*host_rates[host])
+        bucket = _buckets[host]
+    bucket.acquire()
+
+
+def backoff(attempt: int) -> float:
+    """
+    Delay before retry attempt (0 based), full jitter over the exponential step.
+    """
+    return random.uniform(0.5, 1) * min(max_delay, base_delay * 2 ** attempt)
+
+
+def _retry(url: str, attempt: int, start: float, reason: str) -> None:
+    with _lock:
+        retries[host_of(url)] += 1
+    delay = backoff(attempt)
+    if attempt + 1 >= max_attempts or time.monotonic() - start + delay > deadline:
+        raise FetchError(reason + " after " + str(attempt + 1) + " attempts: " + url)
+    time.sleep(delay)
+
+
+def load(driver: webdriver, url: str,
+         markers: tuple[str, ...] = unavailable_markers,
+         ready: tuple[str, str] | None = None) -> str:
+    """
+    Opens url in driver, waiting for ready element (page_ready locator)
+    and reloading while page shows one of markers.
+
+    Returns "ready" or "timeout" (page_ready.wait).
+    """
+    with tracing.span("page_load", url=url) as span:
+        start = time.monotonic()
+        for attempt in range(max_attempts):
+            span.set(attempts=attempt + 1)
+            throttle(url)
+            if attempt == 0:
+                driver.get(url)
+            else:
+                driver.refresh()
+            driver_pool.count_load(driver)
+            state = page_ready.wait(driver, ready, markers)
+            if state != "unavailable":
+                return state
+            _retry(url, attempt, start, "Content unavailable")
+
+
+def get(session: requests.Session, url: str, **kwargs) -> requests.Response:
+    """
+    session.get retried on connection errors and 429 or 5xx responses.
+    """
+    with tracing.span("http_get", url=url) as span:
+        start = time.monotonic()
+        for attempt in range(max_attempts):
+            span.set(attempts=attempt + 1)
+            throttle(url)
+            try:
+                response = session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                _retry(url, attempt, start, type(e).__name__)
+                continue
+            if response.status_code not in retry_statuses:
+                return response
+            response.close()
+            _retry(url, attempt, start, "HTTP " + str(response.status_code))
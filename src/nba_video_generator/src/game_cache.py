@@ -0,0 +1,104 @@
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime, timedelta
+
+
+cache_path = os.path.join(
+    os.path.expanduser("~"), ".nba_video_generator", "game_cache.sqlite"
+)
+recent_ttl = 15 * 60
+use_cache = True
+
+
+def _connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    conn = sqlite3.connect(cache_path, timeout=30)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS locators ("
+        "source TEXT, date TEXT, team TEXT, value TEXT, stored REAL, "
+        "PRIMARY KEY (source, date, team))"
+    )
+    return conn
+
+
+def _is_recent(date: str) -> bool:
+    """
+    Games from yesterday (late tip offs), today, or the future
+    may still change.
+    """
+    cutoff = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    return date >= cutoff
+
+
+def lookup(source: str, date: str, team: str) -> tuple[bool, str | None]:
+    """
+    Looks up game locator for (source, date, team).
+
+    Returns whether it was found and the locator (None if no game that day).
+    """
+    if not use_cache:
+        return False, None
+
+    with closing(_connect()) as conn:
+        row = conn.execute(
+            "SELECT value, stored FROM locators "
+            "WHERE source = ? AND date = ? AND team = ?",
+            (source, date, team.lower())
+        ).fetchone()
+
+    if row is None:
+        return False, None
+
+    value, stored = row
+    if _is_recent(date) and time.time() - stored > recent_ttl:
+        return False, None
+
+    return True, value
+
+
+def store(source: str, date: str, team: str, value: str | None) -> None:
+    """
+    Stores game locator for (source, date, team).
+
+    A value of None records that the team had no game that day.
+    """
+    if not use_cache:
+        return
+
+    with closing(_connect()) as conn:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO locators VALUES (?, ?, ?, ?, ?)",
+                (source, date, team.lower(), value, time.time())
+            )
+
+
+def store_many(source: str, rows: list[tuple[str, str, str | None]]) -> None:
+    """
+    Stores (date, team, value) game locators for source,
+    keeping locators that are already cached.
+    """
+    if not use_cache:
+        return
+
+    now = time.time()
+    with closing(_connect()) as conn:
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO locators VALUES (?, ?, ?, ?, ?)",
+                [(source, date, team.lower(), value, now) for date, team, value in rows]
+            )
+
+
+def clear(source: str | None = None) -> None:
+    """
+    Removes cached game locators (for source if given).
+    """
+    with closing(_connect()) as conn:
+        with conn:
+            if source is None:
+                conn.execute("DELETE FROM locators")
+            else:
+                conn.execute("DELETE FROM locators WHERE source = ?", (source,))
@@ -2,6 +2,7 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from nba_video_generator.src import game_cache, fetch_policy, page_ready, schedule
 
 
 base_url = "https://www.nba.com/games?date="
@@ -24,13 +25,13 @@ def get_box_scores(driver: webdriver, date: str, team: str) -> str:
     """
     Parses the NBA games on date and locates team box score link.
     """
-    driver.get(base_url + date)
-
-    body = driver.find_element(By.TAG_NAME, "body").text.lower()
+    found, game_url = game_cache.lookup("nba", date, team)
+    if found:
+        if game_url is not None:
+            print(game_url)
+        return game_url
 
-    while "content unavailable" in body:
-        driver.refresh()
-        body = driver.find_element(By.TAG_NAME, "body").text.lower()
+    state = fetch_policy.load(driver, base_url + date, ready=page_ready.games_page)
 
     game_urls = driver.find_elements(By.XPATH, boxscore_tag)
 
@@ -38,35 +39,56 @@ def get_box_scores(driver: webdriver, date: str, team: str) -> str:
         game_url = game_url.get_attribute("href")
         if team in game_url:
             print(game_url)
+            game_cache.store("nba", date, team, game_url)
             return game_url
 
+    store_no_game("nba", date, team, state)
     return None
 
 
+def store_no_game(source: str, date: str, team: str, state: str) -> None:
+    """
+    Caches that team had no game on date, only if the page finished
+    loading (state "ready") or the schedule confirms it, so a slow
+    page load does not hide a game.
+    """
+    if state == "ready" or schedule.team_off(team, date):
+        game_cache.store(source, date, team, None)
+
+
 def get_free_throws_or_fouls(driver: webdriver, date: str, team: str) -> str:
     """
     Parses ESPN NBA games on date and locates play by play link
     """
-    driver.get(espn_url + date.replace("-", ""))
+    found, pbp = game_cache.lookup("espn", date, team)
+    if found:
+        if pbp is not None:
+            print(pbp)
+        return pbp
+
+    state = fetch_policy.load(
+        driver, espn_url + date.replace("-", ""), ready=page_ready.espn_scoreboard
+    )
 
     game_urls = WebDriverWait(driver, 10).until(
         EC.presence_of_all_elements_located((By.XPATH, espn_boxscore_tag))
     )
 
-    for game_url in game_urls:
-        if team in espn_team_abbr:
-            team = espn_team_abbr[team]
+    espn_team = espn_team_abbr.get(team, team)
 
+    for game_url in game_urls:
         links = game_url.find_elements(By.XPATH, team_tag)
         for link in links:
             link = link.get_attribute("href")
-            if link.rsplit("/", 1)[0].endswith(team):
+            if link.rsplit("/", 1)[0].endswith(espn_team):
                 cards = game_url.find_elements(By.XPATH, card_tag)
                 for card in cards:
                     card = card.get_attribute("href")
                     if "boxscore" in card:
                         pbp = card.replace("boxscore", "playbyplay")
                         print(pbp)
+                        game_cache.store("espn", date, team, pbp)
                         return pbp
 
+    store_no_game("espn", date, team, state)
     return None
@@ -2,19 +2,19 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from nba_video_generator.src import game_cache, fetch_policy, page_ready
+from nba_video_generator.src.get_box_scores import store_no_game
 
 
 boxscore_tag = "//a[@data-text='BOX SCORE']"
 
 
 def get_pbp(driver: webdriver, base_url: str, date: str, team: str):
-    driver.get(base_url + date)
+    found, box_score_url = game_cache.lookup("nba", date, team)
+    if found:
+        return pbp_from_box_score(box_score_url, team)
 
-    body = driver.find_element(By.TAG_NAME, "body").text.lower()
-
-    while "content unavailable" in body:
-        driver.refresh()
-        body = driver.find_element(By.TAG_NAME, "body").text.lower()
+    state = fetch_policy.load(driver, base_url + date, ready=page_ready.games_page)
 
     box_score_url = ""
 
@@ -28,6 +28,16 @@ def get_pbp(driver: webdriver, base_url: str, date: str, team: str):
             box_score_url = game_url
 
     if box_score_url == "":
+        box_score_url = None
+        store_no_game("nba", date, team, state)
+    else:
+        game_cache.store("nba", date, team, box_score_url)
+
+    return pbp_from_box_score(box_score_url, team)
+
+
+def pbp_from_box_score(box_score_url: str | None, team: str):
+    if box_score_url is None:
         return None, None
 
     home_away = box_score_url.split("vs")[1]
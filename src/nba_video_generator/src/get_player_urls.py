@@ -3,15 +3,16 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 import math
 from unidecode import unidecode
-
-
-box_score_tag = '//table[starts-with(@class, "StatsTable_table")]'
-name_tag = './/span[@class = "GameBoxscoreTablePlayer_gbpNameFull__cf_sn"]'
-time_tag = ".//span[starts-with(@class, 'GamePlayByPlayRow_clockElement')]"
+from nba_video_generator.src import fetch_policy, page_ready
+from nba_video_generator.src.parse_pages import \
+    parse_box_score_rows, parse_espn_rows, game_title
+from nba_video_generator.src.pbp_table import PbpTable, load_table, teams
+from nba_video_generator.src.play import period_number
 
 
 def get_player_urls(
-    driver: webdriver, player_name: str, box_score: str, td_vals: list[int]
+    driver: webdriver, player_name: str, box_score: str, td_vals: list[int],
+    box_score_rows: tuple[str, dict] | None = None
 ) -> tuple[str, str, list[tuple[int, str]]]:
     """
     Parses box score for player event links.
@@ -19,50 +20,50 @@ def get_player_urls(
     Returns list of player event (int) and link.
     
     Example: [("3", link to fg made), ("14", link to reb)]
+
+    box_score_rows is output of load_box_score if already loaded.
     """
-    driver.get(box_score)
-    title = player_name + " Full Highlights " + driver.title.rstrip(" Box Scores | NBA.com")
-    stats = ""
-    body = driver.find_element(By.TAG_NAME, "body").text.lower()
-
-    while "content unavailable" in body:
-        driver.refresh()
-        body = driver.find_element(By.TAG_NAME, "body").text.lower()
-
-    urls = []
-    tables = driver.find_elements(By.XPATH, box_score_tag)
-    for table in tables:
-        rows = table.find_elements(By.TAG_NAME, "tr")
-        for row in rows:
-            try:
-                name = row.find_element(
-                    By.XPATH,
-                    name_tag
-                )
-                if name.text == player_name:
-                    for td_val in td_vals:
-                        try:
-                            event = row.find_element(
-                                By.XPATH, "./td[" + str(td_val) + "]"
-                            )
-                            event_url = event.find_element(
-                                By.TAG_NAME, "a"
-                                ).get_attribute("href")
-                            urls.append((td_val, event_url))
-                        except Exception:
-                            if td_val == 19:
-                                urls.append((td_val, ""))
-                    td_elems = row.find_elements(By.TAG_NAME, "td")
-                    stats = [td.text for td in td_elems]
-                    stats = format_box_score(stats)
-                    print(stats)
-                    return title, stats, urls
-            except Exception:
-                pass
+    if box_score_rows is None:
+        box_score_rows = load_box_score(driver, box_score, [player_name], td_vals)
+    page_title, players = box_score_rows
+    title = player_name + " Full Highlights " + page_title
 
+    if player_name not in players:
+        return title, "", []
+
+    stats, urls = players[player_name]
+    stats = format_box_score(stats)
+    print(stats)
     return title, stats, urls
 
 
+def load_box_score(
+    driver: webdriver, box_score: str, player_names: list[str], td_vals: list[int]
+) -> tuple[str, dict[str, tuple[list[str], list[tuple[int, str]]]]]:
+    """
+    Parses box score once for several players.
+
+    Returns page title and dictionary with player name as key and
+    box score row and list of player event (int) and link as values.
+    """
+    fetch_policy.load(driver, box_score, ready=page_ready.box_score_page)
+    page_title = game_title(driver.title)
+
+    players = {}
+    for name, cells, links in parse_box_score_rows(driver.page_source, driver.current_url):
+        if name not in player_names or name in players:
+            continue
+        urls = []
+        for td_val in td_vals:
+            if td_val in links:
+                urls.append((td_val, links[td_val]))
+            elif td_val == 19:
+                urls.append((td_val, ""))
+        players[name] = (cells, urls)
+
+    return page_title, players
+
+
 def format_box_score(stats: list[str]) -> str:
 
     min_played   = stats[1]
@@ -95,180 +96,167 @@ def format_box_score(stats: list[str]) -> str:
     )
 
 
-def get_ft_urls(
-    driver: webdriver, player_name: str, pbp: str, url: str, include_two: bool = True
-) -> list[tuple[str, str]]:
+def get_ft_and_foul_urls(
+    driver: webdriver, player_name: str, pbp: str, url: str, include_ft: bool = True,
+    include_two: bool = True, include_fouls: bool = True, pages: dict | None = None
+) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
     """
-    Parses play by play for player free throw links.
+    Parses play by play for player free throw and foul links together,
+    walking the ESPN play by play (pbp) once.
 
-    Returns list of player free throw link and quarter.
+    Returns list of player free throw link and quarter and
+    list of player foul link and quarter.
+
+    pages holds play by play already loaded for the game; the NBA
+    play by play is loaded once (period=All) and looked up by clock.
     """
-    if player_name == "Hansen Yang":
-        player_name = "Yang Hansen"
+    player_name = _espn_name(player_name)
 
-    player_name = unidecode(player_name)
+    ft_times, foul_times = get_espn_times(driver, player_name, pbp, include_two, pages)
+
+    last_name = player_name.split()[-1]
 
-    times = _get_ft_times(driver, player_name, pbp, include_two)
+    table = load_table(driver, url + "All", pages)
 
+    ft_urls = []
+    if include_ft:
+        ft_urls = _match_urls(
+            table, ft_times,
+            lambda text: ".FOUL" in text or last_name + " Free Throw" in text
+        )
+    foul_urls = []
+    if include_fouls:
+        foul_urls = _match_urls(
+            table, foul_times, lambda text: ".FOUL" in text and last_name in text
+        )
+
+    return ft_urls, foul_urls
+
+
+def get_nba_ft_and_foul_urls(
+    driver: webdriver, player_name: str, team: str, url: str, include_ft: bool = True,
+    include_two: bool = True, include_fouls: bool = True, pages: dict | None = None
+) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+    """
+    Same as get_ft_and_foul_urls from the NBA play by play alone
+    (no ESPN), for the player of team.
+    """
     last_name = player_name.split()[-1]
 
-    video_urls = []
+    table = load_table(driver, url + "All", pages)
+    home = "true" if teams(url)[1] == team else "false"
 
-    for quarter, fouls in times.items():
-        driver.get(url + quarter)
-        body = driver.find_element(By.TAG_NAME, "body").text.lower()
+    ft_rows = table.free_throw_rows(last_name, home, include_two) if include_ft else []
+    foul_rows = table.foul_rows(last_name, home) if include_fouls else []
 
-        while "content unavailable" in body:
-            driver.refresh()
-            body = driver.find_element(By.TAG_NAME, "body").text.lower()
-        if "OT" in quarter:
-            quarter = str(4 + int(quarter.lstrip("OT")))
-        else:
-            quarter = quarter[1]
-        play_by_play = driver.find_element(By.ID, "playByPlayContainer")
-        rows = play_by_play.find_elements(By.TAG_NAME, "article")
-        for i, row in enumerate(rows):
-            time = row.find_element(By.XPATH, time_tag).text
-            if time.startswith("0"):
-                time = time[1:]
-            if time == fouls[0]:
-                event_text = row.text
-                if ".FOUL" in event_text or \
-                        last_name + " Free Throw" in event_text:
-                    try:
-                        event = row.find_element(
-                            By.TAG_NAME, "a"
-                        ).get_attribute("href")
-                        video_urls.append((event, quarter))
-                    except Exception:
-                        pass
-                if i < len(rows) - 1:
-                    next_time = rows[i + 1].find_element(
-                        By.XPATH, time_tag
-                    ).text
-                    if next_time.startswith("0"):
-                        next_time = next_time[1:]
-                    current_foul_secs = time_to_secs(fouls[0])
-                    next_time_secs = time_to_secs(next_time)
-                    if current_foul_secs != next_time_secs:
-                        fouls.pop(0)
-            if len(fouls) == 0:
-                break
-
-    return video_urls
-
-
-def _get_ft_times(
-    driver: webdriver, player_name: str, pbp: str, include_two: bool = True
-) -> dict[str, list[str]]:
+    return _row_urls(table, ft_rows), _row_urls(table, foul_rows)
+
+
+def get_ft_urls(
+    driver: webdriver, player_name: str, pbp: str, url: str, include_two: bool = True,
+    pages: dict | None = None
+) -> list[tuple[str, str]]:
     """
-    Gets quarter and time of free throws for a player.
+    Parses play by play for player free throw links.
+
+    Returns list of player free throw link and quarter.
     """
-    driver.get(pbp)
+    return get_ft_and_foul_urls(
+        driver, player_name, pbp, url, True, include_two, False, pages
+    )[0]
 
-    play_by_play = driver.find_element(
-        By.CSS_SELECTOR, ".Card.Card--PlayByPlay"
-    )
-    nav_bar = play_by_play.find_element(
-        By.TAG_NAME, "nav"
-    )
-    quarters = nav_bar.find_elements(
-        By.TAG_NAME, "li"
-    )
 
-    times = {}
-    for quarter in quarters:
-        quarter_name = "Q" + quarter.text[0]
-        if quarter.text == "OT":
-            quarter_name = "OT1"
-        elif "OT" in quarter.text:
-            quarter_name = "OT" + quarter.text[0]
+def get_foul_urls(driver: webdriver, player_name: str, pbp: str, url: str,
+                  pages: dict | None = None) -> list[tuple[str, str]]:
+    """
+    Parses play by play for player fouls.
 
-        button = quarter.find_element(By.TAG_NAME, "button")
-        driver.execute_script("arguments[0].click();", button)
+    Returns list of player foul link and quarter.
+    """
+    return get_ft_and_foul_urls(
+        driver, player_name, pbp, url, False, True, True, pages
+    )[1]
 
-        rows = play_by_play.find_elements(By.TAG_NAME, "tr")
-        rows = rows[1:]
-        for i in range(1, len(rows)):
-            row_text = rows[i].text
-            condition = "free throw 1 of 3" in row_text or \
+
+def get_espn_times(
+    driver: webdriver, player_name: str, pbp: str, include_two: bool = True,
+    pages: dict | None = None
+) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """
+    Gets quarter and time of free throws and of fouls for a player
+    in one pass over the ESPN play by play.
+    """
+    ft_times = {}
+    foul_times = {}
+    for quarter_name, rows in _load_espn_rows(driver, pbp, pages).items():
+        for row_text in rows:
+            if player_name not in row_text:
+                continue
+            is_ft = "free throw 1 of 3" in row_text or \
                 "free throw flagrant 1 of 3" in row_text
             if include_two:
-                condition = "free throw 1" in row_text or \
+                is_ft = "free throw 1" in row_text or \
                     "free throw flagrant 1" in row_text or \
                     "technical free throw" in row_text
-            if condition and player_name in row_text:
-                if quarter_name not in times:
-                    times[quarter_name] = []
-                time = row_text.split(maxsplit=1)[0]
-                if "." in time:
-                    rounded_time = round(float(time))
-                    if rounded_time < 10:
-                        time = "0:0" + str(rounded_time)
-                    else:
-                        time = "0:" + str(rounded_time)
-                times[quarter_name].append(time)
-
-    return times
-
-
-def get_foul_urls(driver: webdriver, player_name: str, pbp: str, url: str) -> \
-        list[tuple[str, str]]:
-    """
-    Parses play by play for player fouls.
+            if is_ft:
+                ft_times.setdefault(quarter_name, []).append(_espn_time(row_text))
+            if "foul" in row_text:
+                foul_times.setdefault(quarter_name, []).append(_espn_time(row_text))
 
-    Returns list of player foul link and quarter.
-    """
+    return ft_times, foul_times
+
+
+def _espn_name(player_name: str) -> str:
     if player_name == "Hansen Yang":
-        player_name == "Yang Hansen"
+        player_name = "Yang Hansen"
+    return unidecode(player_name)
 
-    player_name = unidecode(player_name)
 
-    times = _get_foul_times(driver, player_name, pbp)
+def _espn_time(row_text: str) -> str:
+    """
+    Clock of ESPN row, under a minute (7.3) rounded to 0:07.
+    """
+    time = row_text.split(maxsplit=1)[0]
+    if "." in time:
+        rounded_time = round(float(time))
+        if rounded_time < 10:
+            time = "0:0" + str(rounded_time)
+        else:
+            time = "0:" + str(rounded_time)
+    return time
 
-    last_name = player_name.split()[-1]
 
-    video_urls = []
+def _row_urls(table: PbpTable, rows: list[int]) -> list[tuple[str, str]]:
+    return [
+        (table.plays[i].url, str(table.plays[i].period))
+        for i in rows if table.plays[i].url is not None
+    ]
 
-    for quarter, fouls in times.items():
-        driver.get(url + quarter)
-        body = driver.find_element(By.TAG_NAME, "body").text.lower()
 
-        while "content unavailable" in body:
-            driver.refresh()
-            body = driver.find_element(By.TAG_NAME, "body").text.lower()
-        if "OT" in quarter:
-            quarter = str(4 + int(quarter.lstrip("OT")))
-        else:
-            quarter = quarter[1]
-        play_by_play = driver.find_element(By.ID, "playByPlayContainer")
-        rows = play_by_play.find_elements(By.TAG_NAME, "article")
-        for row in rows:
-            time = row.find_element(By.XPATH, time_tag).text
-            if time.startswith("0"):
-                time = time[1:]
-            if time == fouls[0]:
-                event_text = row.text
-                if ".FOUL" in event_text and last_name in event_text:
-                    try:
-                        event = row.find_element(
-                            By.TAG_NAME, "a"
-                        ).get_attribute("href")
-                        video_urls.append((event, quarter))
-                    except Exception:
-                        pass
-                    fouls.pop(0)
-                    if len(fouls) == 0:
-                        break
-
-    return video_urls
-
-
-def _get_foul_times(driver: webdriver, player_name: str, pbp: str) -> dict[str, list[str]]:
+def _match_urls(table: PbpTable, times: dict[str, list[str]], condition) -> \
+        list[tuple[str, str]]:
+    """
+    Video links and quarter of NBA rows at times matching condition on row text.
     """
-    Gets quarter and time of foul for a player.
+    rows = []
+    for quarter, quarter_times in times.items():
+        period = period_number(quarter)
+        for time in dict.fromkeys(quarter_times):
+            rows.extend(i for i in table.at(period, time_to_secs(time)) if condition(table.texts[i]))
+    return _row_urls(table, rows)
+
+
+def _load_espn_rows(driver: webdriver, pbp: str, pages: dict | None = None) -> \
+        dict[str, list[str]]:
     """
-    driver.get(pbp)
+    Loads ESPN play by play once per game.
+
+    Returns quarter name (Q1, OT1) as key and row text as values.
+    """
+    if pages is not None and pbp in pages:
+        return pages[pbp]
+
+    fetch_policy.load(driver, pbp, ready=page_ready.espn_pbp_page)
 
     play_by_play = driver.find_element(
         By.CSS_SELECTOR, ".Card.Card--PlayByPlay"
@@ -280,7 +268,7 @@ def _get_foul_times(driver: webdriver, player_name: str, pbp: str) -> dict[str,
         By.TAG_NAME, "li"
     )
 
-    times = {}
+    quarter_rows = {}
     for quarter in quarters:
         quarter_name = "Q" + quarter.text[0]
         if quarter.text == "OT":
@@ -291,23 +279,12 @@ def _get_foul_times(driver: webdriver, player_name: str, pbp: str) -> dict[str,
         button = quarter.find_element(By.TAG_NAME, "button")
         driver.execute_script("arguments[0].click();", button)
 
-        rows = play_by_play.find_elements(By.TAG_NAME, "tr")
-        rows = rows[1:]
-        for i in range(1, len(rows)):
-            row_text = rows[i].text
-            if player_name in row_text and "foul" in row_text:
-                if quarter_name not in times:
-                    times[quarter_name] = []
-                time = row_text.split(maxsplit=1)[0]
-                if "." in time:
-                    rounded_time = round(float(time))
-                    if rounded_time < 10:
-                        time = "0:0" + str(rounded_time)
-                    else:
-                        time = "0:" + str(rounded_time)
-                times[quarter_name].append(time)
-
-    return times
+        rows = parse_espn_rows(play_by_play.get_attribute("outerHTML"))
+        quarter_rows[quarter_name] = rows[2:]
+
+    if pages is not None:
+        pages[pbp] = quarter_rows
+    return quarter_rows
 
 
 def time_to_secs(time: str) -> int:
@@ -1,189 +1,84 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-
-
-time_tag = ".//span[starts-with(@class, 'GamePlayByPlayRow_clockElement')]"
-desc_tag = ".//span[starts-with(@class, 'GamePlayByPlayRow_desc')]"
+from nba_video_generator.src import fetch_policy, page_ready
+from nba_video_generator.src.parse_pages import parse_pbp_rows, pbp_html, game_title
+from nba_video_generator.src.pbp_table import PbpTable
+from nba_video_generator.src.play import Play
 
 
 def get_plays(driver: webdriver, pbp_url: str, last_name: str, data_is_home_team: str):
-    driver.get(pbp_url)
-
-    title = last_name + " " + driver.title.rstrip(" Play-by-Play | NBA.com") + " Full Play"
-
-    body = driver.find_element(By.TAG_NAME, "body").text.lower()
+    fetch_policy.load(driver, pbp_url, ready=page_ready.pbp_page)
 
-    while "content unavailable" in body:
-        driver.refresh()
-        body = driver.find_element(By.TAG_NAME, "body").text.lower()
+    title = last_name + " " + game_title(driver.title) + " Full Play"
 
     tabs = driver.find_elements(
         By.CSS_SELECTOR,
         'nav[class^="GamePlayByPlay_periods"] button'
     )
-    result = []
+    table = PbpTable()
     quarter = 1
 
     for tab in tabs[:-1]:
         driver.execute_script("arguments[0].click();", tab)
 
-        play_by_play = driver.find_element(By.ID, "playByPlayContainer")
-        rows = play_by_play.find_elements(By.TAG_NAME, "article")
-
-        for i, row in enumerate(rows):
-            if row.get_attribute("data-is-home-team") == data_is_home_team and last_name.lower() in row.text.lower():
-                try:
-                    desc_raw = row.find_element(By.XPATH, desc_tag).text
-                    desc = desc_raw.lower()
-                    play_time = row.find_element(By.XPATH, time_tag).text
-                    if play_time.startswith("0"):
-                        play_time = play_time[1:]
-                    play_time = int(play_time.split(":")[0]) * 60 + int(play_time.split(":")[1])
-                    link = row.find_element(By.TAG_NAME, "a")
-                    video_url = link.get_attribute("href")
-                    if "free throw 1 of" in desc:
-                        try:
-                            foul_link, foul_desc = _find_foul_url(rows, i, play_time)
-                            result.append(
-                                (
-                                    foul_link,
-                                    foul_desc,
-                                    quarter,
-                                    play_time,
-                                )
-                            )
-                        except Exception:
-                            pass
-                    result.append(
-                        (
-                            video_url,
-                            desc_raw,
-                            quarter,
-                            play_time
-                        )
-                    )
-                except Exception:
-                    pass
+        table.add_rows(parse_pbp_rows(pbp_html(driver), driver.current_url), quarter)
         quarter += 1
 
-    result = combine_events(result)
-
-    return title, result
-
-
-def _find_foul_url(rows, i, play_time):
-    for j in range(i - 1, -1, -1):
-        try:
-            t = rows[j].find_element(By.XPATH, time_tag).text
-            if t.startswith("0"):
-                t = t[1:]
-            t = int(t.split(":")[0]) * 60 + int(t.split(":")[1])
-        except:
+    result = []
+    for i in table.player_rows(last_name):
+        play = table.plays[i]
+        if table.homes[i] != data_is_home_team or play.clock is None or play.url is None:
             continue
+        if "free throw 1 of" in play.desc_lower:
+            j = table.foul_before(i)
+            if j is not None and table.plays[j].url is not None:
+                result.append(table.plays[j])
+        result.append(play)
 
-        if t != play_time:
-            break
-
-        desc = rows[j].find_element(By.XPATH, desc_tag).text.lower()
-        if "foul" in desc:
-            link = rows[j].find_element(By.TAG_NAME, "a")
-            return link.get_attribute("href"), rows[j].find_element(By.XPATH, desc_tag).text
+    result = combine_events(result)
 
-    return None
+    return title, result
 
 
-def combine_events(events, max_gap=5):
+def combine_events(events: list[Play], max_gap: int = 5) -> list[Play]:
+    """
+    Merges plays of a period within max_gap seconds into one clip,
+    keeping free throws separate and dropping offensive fouls and timeouts.
+    """
     combined = []
     current = None
 
-    i = 0
-    while i < len(events):
-        url, desc, quarter, time = events[i]
-        desc_l = desc.lower()
-
-        is_free_throw = "free throw" in desc_l
-        is_foul = "foul" in desc_l
-        is_off_foul = "offensive foul" in desc_l or "off. foul" in desc_l
-        is_timeout = "timeout" in desc_l
-
-        event = {
-            "url": url,
-            "desc": desc,
-            "quarter": quarter,
-            "time": time,
-        }
-
+    for play in events:
         # Skip offensive fouls
-        if is_off_foul:
-            i += 1
-            continue
-
-        # Keep free throws separate
-        if is_free_throw:
-            if current:
-                combined.append((
-                    current["url"],
-                    current["desc"],
-                    current["quarter"],
-                    current["time"],
-                ))
-                current = None
-
-            combined.append((url, desc, quarter, time))
-            i += 1
+        if play.is_off_foul:
             continue
 
-        # Keep timeouts separate
-        if is_timeout:
-            if current:
-                combined.append((
-                    current["url"],
-                    current["desc"],
-                    current["quarter"],
-                    current["time"],
-                ))
+        # Keep free throws separate, timeouts end the current play
+        if play.is_free_throw or play.is_timeout:
+            if current is not None:
+                combined.append(current)
                 current = None
-
-            i += 1
+            if play.is_free_throw:
+                combined.append(play)
             continue
 
         if current is None:
-            current = event
-            i += 1
+            current = play
             continue
 
-        current_desc_l = current["desc"].lower()
-
-        same_quarter = quarter == current["quarter"]
-        time_diff = abs(current["time"] - time)
-
         can_merge = (
-            same_quarter
-            and time_diff <= max_gap
-            and "foul" not in current_desc_l
+            play.period == current.period
+            and abs(current.clock - play.clock) <= max_gap
+            and not current.is_foul
         )
 
         if can_merge:
-            current["desc"] = f'{current["desc"]}, {desc}'
-            current["url"] = url
-            current["time"] = max(current["time"], time)
+            current = current.joined(play, max(current.clock, play.clock))
         else:
-            combined.append((
-                current["url"],
-                current["desc"],
-                current["quarter"],
-                current["time"],
-            ))
-            current = event
-
-        i += 1
-
-    if current:
-        combined.append((
-            current["url"],
-            current["desc"],
-            current["quarter"],
-            current["time"],
-        ))
+            combined.append(current)
+            current = play
+
+    if current is not None:
+        combined.append(current)
 
     return combined
@@ -2,31 +2,33 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
+from nba_video_generator.src import fetch_policy, page_ready
+from nba_video_generator.src.pbp_table import PbpTable, load_table
+from nba_video_generator.src.get_player_urls import get_nba_ft_and_foul_urls
+from nba_video_generator.src.play import Play
 
 
 table_tag = '//table[starts-with(@class, "Crom_table")]'
 icon_tag = './/td[starts-with(@class, "Crom_sticky")]'
-desc_tag = ".//span[starts-with(@class, 'GamePlayByPlayRow_desc')]"
-time_tag = ".//span[starts-with(@class, 'GamePlayByPlayRow_clockElement')]"
 video_tag = "//h2[starts-with(@class, 'VideoPlayer_videoTitle')]"
+video_markers = ("content unavailable", "no video available")
 
 
 def get_videos(driver: webdriver, url: str, fg: bool = True) -> \
-        dict[str, list[tuple[str, str]]]:
+        dict[str, list[Play]]:
     """
     From video url, returns event description as key and
-    url and quarter as values.
+    plays (url and period, no clock) as values.
     """
     video_urls = {}
 
-    driver.get(url)
-
-    body = driver.find_element(By.TAG_NAME, "body").text.lower()
-    while "content unavailable" in body or "no video available" in body or "no data available" in body:
-        time.sleep(30)
-        driver.refresh()
-        body = driver.find_element(By.TAG_NAME, "body").text.lower()
+    try:
+        fetch_policy.load(
+            driver, url, video_markers + ("no data available",), page_ready.stats_table
+        )
+    except fetch_policy.FetchError as e:
+        print(e)
+        return video_urls
 
     wait = WebDriverWait(driver, 120)
     table = wait.until(EC.visibility_of_element_located((By.XPATH, table_tag)))
@@ -41,11 +43,13 @@ def get_videos(driver: webdriver, url: str, fg: bool = True) -> \
 
             driver.execute_script("arguments[0].click();", icon)
 
-            video = driver.find_element(By.CLASS_NAME, 'vjs-tech')
+            video = WebDriverWait(driver, 5).until(
+                EC.presence_of_element_located(page_ready.video_page)
+            )
             video_url = video.get_attribute('src')
             if not video_url.endswith("missing.mp4"):
-                description = driver.find_element(
-                    By.XPATH, video_tag
+                description = WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((By.XPATH, video_tag))
                 ).text.lower()
                 if fg:
                     period = row.find_element(By.XPATH, "./td[10]").text
@@ -53,7 +57,7 @@ def get_videos(driver: webdriver, url: str, fg: bool = True) -> \
                     period = row.find_element(By.XPATH, "./td[7]").text
                 if description not in video_urls:
                     video_urls[description] = []
-                video_urls[description].append((video_url, period))
+                video_urls[description].append(Play(video_url, description, period))
 
                 print(f"[{i+1}] Video URL: {video_url}")
         except Exception:
@@ -62,112 +66,100 @@ def get_videos(driver: webdriver, url: str, fg: bool = True) -> \
     return video_urls
 
 
-def sort_plays(driver: webdriver, pbp: str, video_urls: dict[str, list[tuple[str, str]]]) -> \
-        list[tuple[str, str, str]]:
+def sort_plays(driver: webdriver, pbp: str, video_urls: dict[str, list[Play]],
+               pages: dict | None = None) -> list[Play]:
     """
     Sorts the plays by order of description.
 
-    Returns url, quarter, and time.
+    Returns plays with url, period, and clock.
+
+    pages holds play by play already loaded for the game.
     """
     pbp = pbp.rsplit("/", 1)[0] + "/play-by-play?period=All"
 
-    driver.get(pbp)
+    return sort_pbp_rows(load_table(driver, pbp, pages), video_urls)
 
-    body = driver.find_element(By.TAG_NAME, "body").text.lower()
 
-    while "content unavailable" in body:
-        driver.refresh()
-        body = driver.find_element(By.TAG_NAME, "body").text.lower()
+def sort_pbp_rows(table: PbpTable, video_urls: dict[str, list[Play]]) -> list[Play]:
+    """
+    Sorts the plays by order of play by play rows.
 
-    play_by_play = driver.find_element(By.ID, "playByPlayContainer")
-    rows = play_by_play.find_elements(By.TAG_NAME, "article")
+    The k-th video of a description in a period is the k-th row with
+    that description in the period (videos need not be in game order).
+    """
+    matched = []
+    for desc, videos in video_urls.items():
+        rows = table.find(desc)
+        if not all(video.period for video in videos):
+            matched.extend(zip(rows, videos))
+            continue
+        for period in dict.fromkeys(video.period for video in videos):
+            matched.extend(zip(
+                [i for i in rows if table.plays[i].period == period],
+                [video for video in videos if video.period == period]
+            ))
+    matched.sort(key=lambda match: match[0])
 
     result = []
 
-    for row in rows:
-        desc_raw = row.find_element(By.XPATH, desc_tag).text
-        desc = desc_raw.lower()
-
-        if desc in video_urls:
-            play_time = row.find_element(By.XPATH, time_tag).text
-            if play_time.startswith("0"):
-                play_time = play_time[1:]
-            play_time = int(play_time.split(":")[0]) * 60 + int(play_time.split(":")[1])
-
-            video_url, quarter = video_urls[desc][0]
-            if len(result) > 0 and "free throw" not in desc:
-                _, prev_desc, prev_quarter, prev_time = result[-1]
-                if prev_quarter == quarter and prev_time - play_time <= 5 and \
-                        "foul" not in prev_desc and "free throw" not in prev_desc:
-                    result.pop(-1)
-                    result.append(
-                        (
-                            video_url,
-                            prev_desc + ", " + desc_raw,
-                            quarter,
-                            play_time
-                        )
-                    )
-                else:
-                    result.append(
-                    (
-                        video_url,
-                        desc_raw,
-                        quarter,
-                        play_time,
-                    )
-                )
+    for index, video in matched:
+        row = table.plays[index]
+        if row.clock is None:
+            continue
+        play_time = row.clock
+
+        play = Play(video.url, row.desc, video.period, play_time, row.desc_lower)
+        if len(result) > 0 and not play.is_free_throw:
+            prev = result[-1]
+            if prev.period == play.period and prev.clock - play_time <= 5 and \
+                    not prev.is_foul and not prev.is_free_throw:
+                result[-1] = prev.joined(play, play_time)
             else:
-                result.append(
-                    (
-                        video_url,
-                        desc_raw,
-                        quarter,
-                        play_time,
-                    )
-                )
-
-            video_urls[desc].pop(0)
-            if not video_urls[desc]:
-                del video_urls[desc]
-
-            if not video_urls:
-                break
+                result.append(play)
+        else:
+            result.append(play)
 
     return result
 
 
 def get_ft_or_foul_videos(driver: webdriver, urls: list[tuple[str, str]]) -> \
-        dict[str, list[tuple[str, str]]]:
+        dict[str, list[Play]]:
     """
     From free throw or foul url, returns description as key and
-    url and quarter as values.
+    plays (url and period, no clock) as values.
     """
     video_urls = {}
 
     for i, (url, quarter) in enumerate(urls):
         try:
-            driver.get(url)
-
-            body = driver.find_element(By.TAG_NAME, "body").text.lower()
+            fetch_policy.load(driver, url, video_markers, page_ready.video_page)
 
-            while "content unavailable" in body or \
-                    "no video available" in body:
-                driver.refresh()
-                body = driver.find_element(By.TAG_NAME, "body").text.lower()
-
-            video = driver.find_element(By.CLASS_NAME, 'vjs-tech')
+            video = driver.find_element(*page_ready.video_page)
             video_url = video.get_attribute('src')
             if not video_url.endswith("missing.mp4"):
-                description = driver.find_element(
-                    By.XPATH, video_tag
+                description = WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((By.XPATH, video_tag))
                 ).text.lower()
                 if description not in video_urls:
                     video_urls[description] = []
-                video_urls[description].append((video_url, quarter))
+                video_urls[description].append(Play(video_url, description, quarter))
 
                 print(f"[{i+1}] Video URL: {video_url}")
         except Exception:
             pass
 
     return video_urls
+
+
+def get_ft_and_foul_videos(
+    driver: webdriver, pbp: str, player_name: str, team: str, include_ft: bool = True,
+    include_two: bool = True, include_fouls: bool = True, pages: dict | None = None
+) -> dict[str, list[Play]]:
+    """
+    Free throw and foul videos of player of team found in the NBA
+    play by play alone (no ESPN), same output as get_ft_or_foul_videos.
+    """
+    ft_urls, foul_urls = get_nba_ft_and_foul_urls(
+        driver, player_name, team, pbp, include_ft, include_two, include_fouls, pages
+    )
+    return get_ft_or_foul_videos(driver, ft_urls + foul_urls)
@@ -0,0 +1,389 @@
+"""
+Browserless scraping backend.
+
+Reads the Next.js data embedded in nba.com pages and the stats API
+the pages call, with the same signatures as the Selenium scrapers
+(session in place of driver).
+"""
+import json
+from urllib.parse import urlparse, parse_qsl
+import requests
+from requests.adapters import HTTPAdapter
+from nba_video_generator.src import game_cache, fetch_policy
+from nba_video_generator.src.parse_pages import parse_html, game_title
+from nba_video_generator.src.get_pbp_beta import pbp_from_box_score
+from nba_video_generator.src.get_plays_beta import combine_events
+from nba_video_generator.src.get_videos import sort_pbp_rows
+from nba_video_generator.src.pbp_table import PbpTable, teams
+from nba_video_generator.src.play import Play
+
+
+nba_url = "https://www.nba.com"
+stats_url = "https://stats.nba.com/stats"
+headers = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Referer": "https://www.nba.com/",
+    "Origin": "https://www.nba.com",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+stats_headers = {"x-nba-stats-origin": "stats", "x-nba-stats-token": "true"}
+timeout = 30
+
+# Map box score column to stats API context measure.
+td_measure = {
+    3: "FGM", 4: "FGA", 6: "FG3M", 7: "FG3A", 12: "OREB", 13: "DREB",
+    14: "REB", 15: "AST", 16: "STL", 17: "BLK", 18: "TOV", 19: "PF"
+}
+season_types = {
+    "001": "Pre Season", "002": "Regular Season", "003": "All Star",
+    "004": "Playoffs", "005": "PlayIn", "006": "IST"
+}
+
+
+def make_session(pool_size: int = 16) -> requests.Session:
+    """
+    HTTP session with a pool of keep-alive connections per host.
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_page(session: requests.Session, url: str) -> tuple[str, dict]:
+    """
+    Returns page title and the __NEXT_DATA__ JSON embedded in page.
+    """
+    response = fetch_policy.get(session, url, timeout=timeout)
+    response.raise_for_status()
+    html = response.text
+
+    title = ""
+    title_node = parse_html(html[:html.find("</head>") + 7]).find("title")
+    if title_node is not None:
+        title = title_node.text()
+
+    start = html.find('id="__NEXT_DATA__"')
+    if start == -1:
+        raise Exception("No page data in " + url)
+    start = html.find(">", start) + 1
+    end = html.find("</script>", start)
+    return title, json.loads(html[start:end])
+
+
+def stats_api(session: requests.Session, endpoint: str, params: dict) -> dict:
+    response = fetch_policy.get(
+        session, stats_url + "/" + endpoint, params=params, headers=stats_headers, timeout=timeout
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def get_box_scores(session: requests.Session, date: str, team: str) -> str:
+    """
+    Locates team box score link from the NBA games on date.
+    """
+    found, game_url = game_cache.lookup("nba", date, team)
+    if found:
+        if game_url is not None:
+            print(game_url)
+        return game_url
+
+    _, data = get_page(session, nba_url + "/games?date=" + date)
+
+    game_url = None
+    for game in _find_games(data):
+        home = game["homeTeam"]["teamTricode"].lower()
+        away = game["awayTeam"]["teamTricode"].lower()
+        if team in (home, away):
+            game_url = nba_url + "/game/" + away + "-vs-" + home + "-" + \
+                game["gameId"] + "/box-score"
+            print(game_url)
+            break
+
+    game_cache.store("nba", date, team, game_url)
+    return game_url
+
+
+def _find_games(data) -> list[dict]:
+    """
+    Finds game cards (gameId, homeTeam, awayTeam) anywhere in page data.
+    """
+    games = []
+    seen = set()
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if "gameId" in item and isinstance(item.get("homeTeam"), dict) and \
+                    isinstance(item.get("awayTeam"), dict) and \
+                    item["homeTeam"].get("teamTricode") and item["gameId"] not in seen:
+                seen.add(item["gameId"])
+                games.append(item)
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return games
+
+
+def load_box_score(
+    session: requests.Session, box_score: str, player_names: list[str], td_vals: list[int]
+) -> tuple[str, dict[str, tuple[list[str], list[tuple[int, str]]]]]:
+    """
+    Same as get_player_urls.load_box_score from page data.
+    """
+    title, data = get_page(session, box_score)
+    game = data["props"]["pageProps"]["game"]
+    game_id = game["gameId"]
+    season = _season(game_id)
+    season_type = season_types.get(game_id[:3], "Regular Season")
+
+    page_title = game_title(title)
+
+    players = {}
+    for team in (game["awayTeam"], game["homeTeam"]):
+        for player in team.get("players", []):
+            name = (player.get("firstName", "") + " " + player.get("familyName", "")).strip()
+            if name not in player_names or name in players:
+                continue
+            cells = _box_score_cells(name, player.get("statistics", {}))
+            urls = []
+            for td_val in td_vals:
+                count = cells[td_val - 1]
+                if td_val in td_measure and count not in ("", "0"):
+                    urls.append((td_val, _events_url(
+                        game_id, player["personId"], team["teamId"],
+                        td_measure[td_val], season, season_type
+                    )))
+                elif td_val == 19:
+                    urls.append((td_val, ""))
+            players[name] = (cells, urls)
+
+    return page_title, players
+
+
+def _season(game_id: str) -> str:
+    year = 2000 + int(game_id[3:5])
+    return str(year) + "-" + str(year + 1)[2:]
+
+
+def _box_score_cells(name: str, stats: dict) -> list[str]:
+    """
+    Box score row in the column order of the nba.com table.
+    """
+    def stat(key):
+        return str(stats.get(key, ""))
+
+    def pct(key):
+        return str(round(stats.get(key, 0) * 100, 1))
+
+    minutes = str(stats.get("minutes", ""))
+    if minutes.startswith("PT"):
+        minutes = _clock(minutes)
+    plus_minus = stats.get("plusMinusPoints", 0)
+
+    return [
+        name, minutes,
+        stat("fieldGoalsMade"), stat("fieldGoalsAttempted"), pct("fieldGoalsPercentage"),
+        stat("threePointersMade"), stat("threePointersAttempted"), pct("threePointersPercentage"),
+        stat("freeThrowsMade"), stat("freeThrowsAttempted"), pct("freeThrowsPercentage"),
+        stat("reboundsOffensive"), stat("reboundsDefensive"), stat("reboundsTotal"),
+        stat("assists"), stat("steals"), stat("blocks"), stat("turnovers"),
+        stat("foulsPersonal"), stat("points"), str(int(plus_minus))
+    ]
+
+
+def _events_url(game_id: str, player_id, team_id, measure: str,
+                season: str, season_type: str) -> str:
+    return (
+        nba_url + "/stats/events?CFID=&CFPARAMS=&ContextMeasure=" + measure +
+        "&GameID=" + game_id + "&PlayerID=" + str(player_id) +
+        "&Season=" + season + "&SeasonType=" + season_type.replace(" ", "%20") +
+        "&TeamID=" + str(team_id) + "&flag=3&sct=plot&section=game"
+    )
+
+
+def _clock(clock: str) -> str:
+    """
+    Converts ISO duration (PT11M42.00S) to clock (11:42).
+    """
+    minutes, seconds = clock[2:].rstrip("S").split("M")
+    # Tenths under a minute are rounded as on the play by play page.
+    minutes, seconds = divmod(int(minutes) * 60 + round(float(seconds)), 60)
+    return str(minutes) + ":" + str(seconds).zfill(2)
+
+
+def get_videos(session: requests.Session, url: str, fg: bool = True) -> \
+        dict[str, list[Play]]:
+    """
+    Same as get_videos.get_videos from the stats API behind the events page.
+    """
+    params = {
+        "LeagueID": "00", "EndPeriod": "0", "EndRange": "40800", "StartPeriod": "0",
+        "StartRange": "0", "LastNGames": "0", "Month": "0", "OpponentTeamID": "0",
+        "PORound": "0", "Period": "0", "RangeType": "0",
+    }
+    for key, value in parse_qsl(urlparse(url).query, keep_blank_values=True):
+        if key not in ("flag", "sct", "section"):
+            params[key] = value
+
+    data = stats_api(session, "videodetailsasset", params)
+    video_links = data["resultSets"]["Meta"]["videoUrls"]
+    playlist = data["resultSets"]["playlist"]
+
+    video_urls = {}
+    for i, (video, play) in enumerate(zip(video_links, playlist)):
+        video_url = video.get("lurl") or video.get("murl")
+        if not video_url or video_url.endswith("missing.mp4"):
+            continue
+        description = play["dsc"].lower()
+        if description not in video_urls:
+            video_urls[description] = []
+        video_urls[description].append(Play(video_url, description, play["p"]))
+
+        print(f"[{i+1}] Video URL: {video_url}")
+
+    return video_urls
+
+
+def _pbp_page(session: requests.Session, pbp: str, pages: dict | None = None) -> \
+        tuple[str, dict, list[dict]]:
+    if pages is not None and pbp in pages:
+        return pages[pbp]
+
+    title, data = get_page(session, pbp)
+    actions = data["props"]["pageProps"]["playByPlay"]["actions"]
+
+    if pages is not None:
+        pages[pbp] = (title, data, actions)
+    return title, data, actions
+
+
+def sort_plays(session: requests.Session, pbp: str,
+               video_urls: dict[str, list[Play]],
+               pages: dict | None = None) -> list[Play]:
+    """
+    Same as get_videos.sort_plays from page data.
+    """
+    pbp = pbp.rsplit("/", 1)[0] + "/play-by-play?period=All"
+    return sort_pbp_rows(_pbp_table(session, pbp, pages), video_urls)
+
+
+def _pbp_table(session: requests.Session, pbp: str, pages: dict | None = None) -> PbpTable:
+    """
+    PbpTable of page actions (row i is action i, no urls), built once per game.
+    """
+    key = ("actions", pbp)
+    if pages is not None and key in pages:
+        return pages[key]
+
+    _, _, actions = _pbp_page(session, pbp, pages)
+    table = PbpTable()
+    for action in actions:
+        table.add(
+            action["period"], _secs(action["clock"]), action.get("description", ""),
+            text=action.get("description", ""), home=action.get("teamTricode", "").lower()
+        )
+
+    if pages is not None:
+        pages[key] = table
+    return table
+
+
+def get_ft_and_foul_videos(
+    session: requests.Session, pbp: str, player_name: str, team: str, include_ft: bool = True,
+    include_two: bool = True, include_fouls: bool = True, pages: dict | None = None
+) -> dict[str, list[Play]]:
+    """
+    Same as get_videos.get_ft_and_foul_videos from page data.
+    """
+    pbp = pbp.rsplit("/", 1)[0] + "/play-by-play?period=All"
+    _, data, actions = _pbp_page(session, pbp, pages)
+    table = _pbp_table(session, pbp, pages)
+    game_id = _game_id(data, pbp)
+    last_name = player_name.split()[-1]
+
+    rows = table.free_throw_rows(last_name, team, include_two) if include_ft else []
+    if include_fouls:
+        rows = rows + table.foul_rows(last_name, team)
+
+    video_urls = {}
+    for i in sorted(set(rows)):
+        video_url = _clip_url(session, game_id, actions[i]["actionNumber"])
+        if video_url is None:
+            continue
+        play = table.plays[i]
+        if play.desc_lower not in video_urls:
+            video_urls[play.desc_lower] = []
+        video_urls[play.desc_lower].append(Play(video_url, play.desc_lower, play.period))
+
+        print(f"[{i+1}] Video URL: {video_url}")
+
+    return video_urls
+
+
+def _game_id(data: dict, pbp_url: str) -> str:
+    game = data["props"]["pageProps"].get("game", {})
+    return game.get("gameId") or pbp_url.rsplit("/", 1)[0].rsplit("-", 1)[1]
+
+
+def get_pbp(session: requests.Session, base_url: str, date: str, team: str):
+    """
+    Same as get_pbp_beta.get_pbp from page data.
+    """
+    return pbp_from_box_score(get_box_scores(session, date, team), team)
+
+
+def get_plays(session: requests.Session, pbp_url: str, last_name: str,
+              data_is_home_team: str):
+    """
+    Same as get_plays_beta.get_plays from page data.
+
+    Links are clip (mp4) links rather than video pages.
+    """
+    pages = {}
+    title, data, actions = _pbp_page(session, pbp_url, pages)
+    game_id = _game_id(data, pbp_url)
+    away, home = teams(pbp_url)
+    team = home if data_is_home_team == "true" else away
+
+    title = last_name + " " + game_title(title) + " Full Play"
+
+    table = _pbp_table(session, pbp_url, pages)
+
+    result = []
+    for i in table.player_rows(last_name):
+        action = actions[i]
+        play = table.plays[i]
+        if table.homes[i] != team or not action.get("videoAvailable", 1):
+            continue
+        if "free throw 1 of" in play.desc_lower:
+            j = table.foul_before(i)
+            if j is not None:
+                foul_link = _clip_url(session, game_id, actions[j]["actionNumber"])
+                if foul_link is not None:
+                    result.append(table.plays[j].with_url(foul_link))
+        video_url = _clip_url(session, game_id, action["actionNumber"])
+        if video_url is not None:
+            result.append(play.with_url(video_url))
+
+    return title, combine_events(result)
+
+
+def _secs(clock: str) -> int:
+    minutes, seconds = _clock(clock).split(":")
+    return int(minutes) * 60 + int(seconds)
+
+
+def _clip_url(session: requests.Session, game_id: str, event_id) -> str | None:
+    data = stats_api(session, "videoeventsasset", {"GameEventID": event_id, "GameID": game_id})
+    video_links = data["resultSets"]["Meta"]["videoUrls"]
+    if not video_links:
+        return None
+    video_url = video_links[0].get("lurl") or video_links[0].get("murl")
+    if not video_url or video_url.endswith("missing.mp4"):
+        return None
+    return video_url
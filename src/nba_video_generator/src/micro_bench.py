@@ -0,0 +1,248 @@
+"""
+Micro benchmarks of the play processing functions.
+
+Synthetic play by play (full games, multiple overtimes, a season of
+games for a roster) is timed through combine_events, sort_pbp_rows,
+time_to_secs, format_box_score, and the free throw and foul clock
+matching, with peak memory from tracemalloc.
+
+Each benchmark also runs at scale times its size; a growth exponent
+above max_exponent (about linear expected) flags quadratic behavior
+on any machine (quadratic is 2). Against a stored baseline, time or memory above
+max_ratio times the baseline fails the check.
+
+    python -m nba_video_generator.src.micro_bench --save
+    python -m nba_video_generator.src.micro_bench --check
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import tracemalloc
+from nba_video_generator.src.play import Play
+from nba_video_generator.src.pbp_table import PbpTable
+from nba_video_generator.src.get_plays_beta import combine_events
+from nba_video_generator.src.get_videos import sort_pbp_rows
+from nba_video_generator.src.get_player_urls import \
+    time_to_secs, format_box_score, _match_urls
+
+
+# Baseline committed with the package (rerun --save after intended changes).
+baseline_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "micro_bench_baseline.json")
+max_ratio = 1.5
+max_exponent = 1.6
+scale = 4
+repeats = 7
+
+roster = [
+    "Tatum", "Brown", "White", "Holiday", "Porzingis", "Horford", "Pritchard", "Hauser",
+    "James", "Davis", "Reaves", "Russell", "Hachimura", "Vincent", "Prince", "Wood",
+]
+
+templates = [
+    "{p} 25' 3PT Jump Shot ({n} PTS)", "MISS {p} 18' Jump Shot", "{p} REBOUND (Off:0 Def:{n})",
+    "{p} Driving Layup ({n} PTS) ({q} {n} AST)", "{p} S.FOUL (P{f}.T{f})", "{p} P.FOUL (P{f}.T{f})",
+    "{p} Free Throw 1 of 2 ({n} PTS)", "{p} Free Throw 2 of 2 ({n} PTS)",
+    "{p} Bad Pass Turnover (P{f}.T{n})", "{p} BLOCK ({n} BLK)", "{p} STEAL ({n} STL)",
+    "{p} Free Throw Technical ({n} PTS)", "{p} OFF.Foul (P{f}.T{f})", "Timeout: Regular (Reg.{f} Short 0)",
+]
+
+
+def synthetic_game(seed: int = 0, overtimes: int = 0, plays_per_period: int = 110) -> list[dict]:
+    """
+    Play by play rows (as parse_pbp_rows) of a game with overtimes.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for period in range(1, 5 + overtimes):
+        length = 720 if period <= 4 else 300
+        clocks = [length] + sorted(
+            (rng.randint(0, length - 1) for _ in range(plays_per_period - 1)), reverse=True
+        )
+        for clock in clocks:
+            player = rng.randrange(len(roster))
+            desc = rng.choice(templates).format(
+                p=roster[player], q=roster[rng.randrange(len(roster))],
+                n=rng.randint(1, 40), f=rng.randint(1, 6)
+            )
+            rows.append({
+                "desc": desc, "time": str(clock // 60) + ":" + str(clock % 60).zfill(2),
+                "url": "https://www.nba.com/stats/events?GameEventID=" + str(len(rows)),
+                "text": desc, "home": "true" if player < len(roster) // 2 else "false",
+                "period": period,
+            })
+    return rows
+
+
+def synthetic_season(games: int = 82, seed: int = 0) -> list[list[dict]]:
+    """
+    Games of a season, about one in twelve going to (up to triple) overtime.
+    """
+    rng = random.Random(seed)
+    return [
+        synthetic_game(seed * 1000 + i, rng.choice([0] * 11 + [1, 2, 3]))
+        for i in range(games)
+    ]
+
+
+def player_plays(game: list[dict], name: str) -> list[Play]:
+    return [
+        Play(row["url"], row["desc"], row["period"], time_to_secs(row["time"]))
+        for row in game if name in row["desc"]
+    ]
+
+
+def espn_times(game: list[dict], name: str) -> dict[str, list[str]]:
+    """
+    Free throw and foul times of name by quarter name, as read from ESPN.
+    """
+    times = {}
+    for row in game:
+        if name in row["desc"] and ("Free Throw" in row["desc"] or "FOUL" in row["desc"]):
+            period = row["period"]
+            quarter = "Q" + str(period) if period <= 4 else "OT" + str(period - 4)
+            times.setdefault(quarter, []).append(row["time"])
+    return times
+
+
+def box_score_row(rng: random.Random) -> list[str]:
+    return [rng.choice(roster), "34:12"] + [str(rng.randint(0, 20)) for _ in range(18)] + \
+        [str(rng.randint(-20, 20))]
+
+
+def cases(size: int) -> dict:
+    """
+    Benchmarks of size games (function, no argument).
+    """
+    season = synthetic_season(size)
+    tables = [PbpTable.from_rows(game) for game in season]
+    plays = [player_plays(game, name) for game in season for name in roster[:4]]
+    times = [row["time"] for game in season for row in game]
+    rng = random.Random(size)
+    box_scores = [box_score_row(rng) for _ in range(size * len(roster))]
+    videos = []
+    for game in season:
+        video_urls = {}
+        for row in game[::3]:
+            desc = row["desc"].lower()
+            video_urls.setdefault(desc, []).append(Play(row["url"], desc, row["period"]))
+        videos.append(video_urls)
+    ft_times = [espn_times(game, name) for game in season for name in roster[:4]]
+
+    def match():
+        for i, table in enumerate(tables):
+            for name, player_times in zip(roster[:4], ft_times[i * 4:i * 4 + 4]):
+                _match_urls(table, player_times, lambda text: ".FOUL" in text or name in text)
+                table.free_throw_rows(name, "true")
+                table.foul_rows(name, "true")
+
+    return {
+        "combine_events": lambda: [combine_events(events) for events in plays],
+        "pbp_table": lambda: [PbpTable.from_rows(game) for game in season],
+        "sort_pbp_rows": lambda: [
+            sort_pbp_rows(table, video_urls) for table, video_urls in zip(tables, videos)
+        ],
+        "time_to_secs": lambda: [time_to_secs(t) for t in times],
+        "format_box_score": lambda: [format_box_score(stats) for stats in box_scores],
+        "ft_foul_matching": match,
+    }
+
+
+def _measure(fn) -> tuple[float, int]:
+    """
+    Best wall time of repeats runs and peak traced memory of one run.
+    """
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(size: int = 82, names: list[str] | None = None) -> dict:
+    """
+    Seconds and peak bytes of each benchmark at size games (a season),
+    with the growth exponent of time at scale times size.
+    """
+    small = cases(size)
+    large = cases(size * scale)
+    results = {}
+    for name in names or list(small):
+        seconds, peak = _measure(small[name])
+        large_seconds, _ = _measure(large[name])
+        results[name] = {
+            "seconds": seconds, "peak_bytes": peak,
+            "exponent": math.log(max(large_seconds, 1e-9) / max(seconds, 1e-9), scale),
+        }
+    return {"size": size, "results": results}
+
+
+def check(results: dict, baseline: dict | None = None) -> list[str]:
+    """
+    Regressions of results: growth exponent above max_exponent, and
+    seconds or peak bytes above max_ratio times baseline (same size).
+    """
+    failures = []
+    for name, result in results["results"].items():
+        if result["exponent"] > max_exponent:
+            failures.append(
+                name + ": time grows as size^" + format(result["exponent"], ".2f")
+            )
+        if baseline is None or baseline.get("size") != results["size"]:
+            continue
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        for key in ("seconds", "peak_bytes"):
+            if old[key] and result[key] > max_ratio * old[key]:
+                failures.append(
+                    name + ": " + key + " " + format(result[key] / old[key], ".2f") +
+                    "x baseline"
+                )
+    return failures
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Micro benchmarks of play processing.")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default all)")
+    parser.add_argument("--size", type=int, default=82, help="games per run")
+    parser.add_argument("--baseline", default=baseline_path)
+    parser.add_argument("--save", action="store_true", help="store results as baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 on regressions")
+    args = parser.parse_args(argv)
+
+    results = run(args.size, args.names or None)
+    for name, result in results["results"].items():
+        print(
+            f"{name:<18} {result['seconds'] * 1000:10.2f} ms "
+            f"{result['peak_bytes'] / 1024:10.0f} KiB  size^{result['exponent']:.2f}"
+        )
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+
+    if args.check:
+        failures = check(results, baseline)
+        for failure in failures:
+            print("REGRESSION " + failure)
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
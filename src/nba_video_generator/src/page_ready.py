@@ -0,0 +1,65 @@
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from nba_video_generator.src.parse_pages import pbp_container_id
+
+
+timeout = 10
+poll = 0.2
+
+# Element showing each page type is rendered.
+games_page = (By.XPATH, "//a[@data-text='BOX SCORE']")
+box_score_page = (By.CSS_SELECTOR, "table[class^='StatsTable_table']")
+pbp_page = (By.ID, pbp_container_id)
+stats_table = (By.XPATH, '//table[starts-with(@class, "Crom_table")]')
+video_page = (By.CSS_SELECTOR, "video.vjs-tech")
+espn_scoreboard = (By.XPATH, '//section[starts-with(@class, "Scoreboard")]')
+espn_pbp_page = (By.CSS_SELECTOR, ".Card.Card--PlayByPlay")
+
+# One round trip: the ready element is looked up first, so the
+# page text is only read while the page is not ready.
+_probe_script = """
+const [by, value, markers] = arguments;
+let node = null;
+if (by === "xpath") {
+    node = document.evaluate(
+        value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+} else if (by === "id") {
+    node = document.getElementById(value);
+} else if (by) {
+    node = document.querySelector(value);
+}
+if (node) return "ready";
+const text = document.body ? document.body.innerText.toLowerCase() : "";
+if (markers.some(marker => text.includes(marker))) return "unavailable";
+if (!by && document.readyState === "complete") return "ready";
+return null;
+"""
+
+
+def probe(driver: webdriver, ready: tuple[str, str] | None = None,
+          markers: tuple[str, ...] = ()) -> str | None:
+    """
+    Returns "ready" if ready element is present (or page loaded
+    if ready is None), "unavailable" if page shows a marker, else None.
+    """
+    by, value = ready if ready is not None else (None, None)
+    return driver.execute_script(_probe_script, by, value, list(markers))
+
+
+def wait(driver: webdriver, ready: tuple[str, str] | None = None,
+         markers: tuple[str, ...] = (), timeout: float = timeout) -> str:
+    """
+    Waits until page is ready or unavailable.
+
+    Returns "ready", "unavailable", or "timeout" (some pages
+    legitimately lack the element, such as a date without games).
+    """
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=poll).until(
+            lambda driver: probe(driver, ready, markers)
+        )
+    except TimeoutException:
+        return "timeout"
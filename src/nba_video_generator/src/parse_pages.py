@@ -0,0 +1,247 @@
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from nba_video_generator.src import tracing
+from nba_video_generator.src.play import period_number
+
+
+pbp_container_id = "playByPlayContainer"
+desc_class = "GamePlayByPlayRow_desc"
+period_class = "GamePlayByPlay_period"
+time_class = "GamePlayByPlayRow_clockElement"
+box_score_class = "StatsTable_table"
+name_class = "GameBoxscoreTablePlayer_gbpNameFull__cf_sn"
+espn_pbp_class = "Card--PlayByPlay"
+
+void_tags = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr"
+}
+block_tags = {
+    "address", "article", "aside", "blockquote", "br", "caption", "dd",
+    "div", "dl", "dt", "figcaption", "figure", "footer", "form", "h1",
+    "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+    "ol", "p", "pre", "section", "table", "tbody", "tfoot", "thead",
+    "tr", "ul"
+}
+cell_tags = {"td", "th"}
+skip_tags = {"script", "style", "noscript", "template"}
+
+
+class Node:
+    """
+    Element of a parsed page.
+    """
+    __slots__ = ("tag", "attrs", "children")
+
+    def __init__(self, tag: str, attrs: dict[str, str]):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+
+    def get(self, name: str, default: str | None = None) -> str | None:
+        return self.attrs.get(name, default)
+
+    def has_class(self, prefix: str) -> bool:
+        """
+        Whether class attribute starts with prefix.
+        """
+        return self.attrs.get("class", "").startswith(prefix)
+
+    def iter(self, tag: str | None = None):
+        """
+        Yields descendant elements (with tag if given) in document order.
+        """
+        stack = list(reversed(self.children))
+        while stack:
+            child = stack.pop()
+            if isinstance(child, Node):
+                if tag is None or child.tag == tag:
+                    yield child
+                stack.extend(reversed(child.children))
+
+    def find(self, tag: str | None = None, class_prefix: str | None = None):
+        """
+        Returns first descendant element matching tag and class prefix.
+        """
+        for node in self.iter(tag):
+            if class_prefix is None or node.has_class(class_prefix):
+                return node
+        return None
+
+    def find_all(self, tag: str | None = None, class_prefix: str | None = None) -> list:
+        return [
+            node for node in self.iter(tag)
+            if class_prefix is None or node.has_class(class_prefix)
+        ]
+
+    def text(self) -> str:
+        """
+        Text similar to WebElement.text (whitespace collapsed,
+        block elements on separate lines).
+        """
+        parts = []
+        _collect_text(self, parts)
+        lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+
+def _collect_text(node: Node, parts: list[str]) -> None:
+    if node.tag in skip_tags:
+        return
+    if node.tag in block_tags:
+        parts.append("\n")
+    for child in node.children:
+        if isinstance(child, Node):
+            _collect_text(child, parts)
+        else:
+            parts.append(child)
+    if node.tag in block_tags:
+        parts.append("\n")
+    elif node.tag in cell_tags:
+        parts.append(" ")
+
+
+class _TreeBuilder(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {})
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: value or "" for name, value in attrs})
+        self.stack[-1].children.append(node)
+        if tag not in void_tags:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {name: value or "" for name, value in attrs})
+        self.stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+
+def parse_html(html: str) -> Node:
+    """
+    Parses page (or element outerHTML) into a tree of Node.
+    """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def game_title(title: str) -> str:
+    """
+    Game of NBA page title ("LAL @ BOS Box Scores | NBA.com" is "LAL @ BOS").
+    """
+    return re.sub(r"\s*(Box Scores?|Play-by-Play)?\s*\|\s*NBA\.com\s*$", "", title)
+
+
+def outer_html(driver: webdriver, by: str, value: str) -> str:
+    """
+    Snapshot of an element in a single WebDriver round trip.
+    """
+    return driver.find_element(by, value).get_attribute("outerHTML")
+
+
+def pbp_html(driver: webdriver) -> str:
+    return outer_html(driver, By.ID, pbp_container_id)
+
+
+@tracing.traced()
+def parse_pbp_rows(html: str, base_url: str = "") -> list[dict[str, str | None]]:
+    """
+    Parses NBA play by play rows.
+
+    Returns list of row (desc, time, url, text, home, period) where
+    time has leading zero removed, url is None if missing, and period
+    is read from the period header (Q1, OT1) before the row
+    (None without headers).
+    """
+    root = parse_html(html)
+    container = next(
+        (node for node in root.iter() if node.get("id") == pbp_container_id), root
+    )
+
+    rows = []
+    period = None
+    for node in container.iter():
+        if node.has_class(period_class):
+            period = period_number(node.text()) or period
+            continue
+        if node.tag != "article":
+            continue
+        desc = node.find("span", desc_class)
+        clock = node.find("span", time_class)
+        link = node.find("a")
+        time = clock.text() if clock is not None else ""
+        if time.startswith("0"):
+            time = time[1:]
+        url = None
+        if link is not None and link.get("href"):
+            url = urljoin(base_url, link.get("href"))
+        rows.append({
+            "desc": desc.text() if desc is not None else "",
+            "time": time,
+            "url": url,
+            "text": node.text(),
+            "home": node.get("data-is-home-team"),
+            "period": period,
+        })
+
+    return rows
+
+
+@tracing.traced()
+def parse_box_score_rows(html: str, base_url: str = "") -> \
+        list[tuple[str, list[str], dict[int, str]]]:
+    """
+    Parses NBA box score player rows.
+
+    Returns list of player name, cell text, and
+    cell number (1-based) to link.
+    """
+    root = parse_html(html)
+
+    rows = []
+    for table in root.find_all("table", box_score_class):
+        for row in table.iter("tr"):
+            name = next(
+                (span for span in row.iter("span") if span.get("class") == name_class),
+                None
+            )
+            if name is None:
+                continue
+            cells = [cell for cell in row.children if isinstance(cell, Node) and cell.tag == "td"]
+            links = {}
+            for i, cell in enumerate(cells, 1):
+                link = cell.find("a")
+                if link is not None and link.get("href"):
+                    links[i] = urljoin(base_url, link.get("href"))
+            rows.append((name.text(), [cell.text() for cell in cells], links))
+
+    return rows
+
+
+@tracing.traced()
+def parse_espn_rows(html: str) -> list[str]:
+    """
+    Parses ESPN play by play card into row text.
+    """
+    root = parse_html(html)
+    card = next(
+        (node for node in root.iter() if espn_pbp_class in node.get("class", "").split()),
+        root
+    )
+    return [row.text().replace("\n", " ") for row in card.iter("tr")]
@@ -0,0 +1,166 @@
+from selenium import webdriver
+from nba_video_generator.src import fetch_policy, page_ready
+from nba_video_generator.src.parse_pages import parse_pbp_rows, pbp_html
+from nba_video_generator.src.play import Play
+
+
+class PbpTable:
+    """
+    Play by play of one game, built once and indexed by
+    (period, clock seconds), lowered description, and player name.
+
+    Row i is plays[i] (url None if missing) with row text texts[i]
+    and home team flag homes[i].
+    """
+
+    def __init__(self):
+        self.plays = []
+        self.texts = []
+        self.homes = []
+        self.by_clock = {}
+        self.by_desc = {}
+        self._by_player = {}
+
+    @classmethod
+    def from_rows(cls, rows: list[dict], period: int | None = None) -> "PbpTable":
+        """
+        Table of parse_pbp_rows rows, in period (a period tab) or
+        else the period of each row (1 if the page had no headers).
+        """
+        table = cls()
+        table.add_rows(rows, period)
+        return table
+
+    def add_rows(self, rows: list[dict], period: int | None = None) -> None:
+        for row in rows:
+            self.add(
+                period or row.get("period") or 1, clock_secs(row["time"]),
+                row["desc"], row["url"], row["text"], row["home"]
+            )
+
+    def add(self, period: int, clock: int | None, desc: str, url: str | None = None,
+            text: str = "", home: str | None = None) -> int:
+        index = len(self.plays)
+        play = Play(url, desc, period, clock)
+        self.plays.append(play)
+        self.texts.append(text)
+        self.homes.append(home)
+        if clock is not None:
+            self.by_clock.setdefault((play.period, clock), []).append(index)
+        self.by_desc.setdefault(play.desc_lower, []).append(index)
+        self._by_player.clear()
+        return index
+
+    def at(self, period: int, clock: int) -> list[int]:
+        """
+        Rows at clock of period in order.
+        """
+        return self.by_clock.get((period, clock), [])
+
+    def find(self, desc_lower: str) -> list[int]:
+        """
+        Rows with (lowered) description in order.
+        """
+        return self.by_desc.get(desc_lower, [])
+
+    def player_rows(self, name: str) -> list[int]:
+        """
+        Rows whose text mentions name (any case), indexed on first use.
+        """
+        name = name.lower()
+        if name not in self._by_player:
+            self._by_player[name] = [
+                i for i, text in enumerate(self.texts) if name in text.lower()
+            ]
+        return self._by_player[name]
+
+    def free_throw_rows(self, last_name: str, home: str | None,
+                        include_two: bool = True) -> list[int]:
+        """
+        Fouls and free throws of the player (last_name, team home flag home)
+        at the clocks of the player's first free throws
+        (only 1 of 3 without include_two).
+        """
+        clocks = []
+        for i in self.player_rows(last_name):
+            play = self.plays[i]
+            if self.homes[i] == home and play.clock is not None and \
+                    _is_first_free_throw(play.desc_lower, include_two):
+                clocks.append((play.period, play.clock))
+
+        rows = []
+        for period, clock in dict.fromkeys(clocks):
+            for i in self.at(period, clock):
+                text = self.texts[i]
+                if ".FOUL" in text or last_name + " Free Throw" in text:
+                    rows.append(i)
+        return rows
+
+    def foul_rows(self, last_name: str, home: str | None) -> list[int]:
+        """
+        Fouls of the player (last_name, team home flag home).
+        """
+        return [
+            i for i in self.player_rows(last_name)
+            if self.homes[i] == home and ".FOUL" in self.texts[i]
+        ]
+
+    def foul_before(self, index: int) -> int | None:
+        """
+        Nearest foul row before row index at the same clock.
+        """
+        play = self.plays[index]
+        if play.clock is None:
+            return None
+        for i in reversed(self.at(play.period, play.clock)):
+            if i < index and self.plays[i].is_foul:
+                return i
+        return None
+
+
+def _is_first_free_throw(desc_lower: str, include_two: bool = True) -> bool:
+    if include_two:
+        return "free throw 1 of" in desc_lower or \
+            "free throw flagrant 1 of" in desc_lower or \
+            "free throw technical" in desc_lower
+    return "free throw 1 of 3" in desc_lower or "free throw flagrant 1 of 3" in desc_lower
+
+
+def teams(pbp_url: str) -> tuple[str, str]:
+    """
+    Away and home team of NBA game url (.../game/bos-vs-lal-0022400001/...).
+    """
+    slug = pbp_url.rsplit("/", 2)[1]
+    away, home = slug.split("-vs-")
+    return away, home.rsplit("-", 1)[0]
+
+
+def clock_secs(play_time: str) -> int | None:
+    """
+    Seconds of clock (11:42, or 0:04.2 under a minute rounded to 4
+    like ESPN clocks), None if not a clock.
+    """
+    try:
+        return int(play_time.split(":")[0]) * 60 + round(float(play_time.split(":")[1]))
+    except (IndexError, ValueError):
+        return None
+
+
+def load_table(driver: webdriver, pbp: str, pages: dict | None = None) -> PbpTable:
+    """
+    Loads full NBA play by play (period=All) once per game.
+
+    pages holds tables already built for the game (keyed apart from
+    raw pages of the same url).
+    """
+    key = ("table", pbp)
+    if pages is not None and key in pages:
+        return pages[key]
+
+    fetch_policy.load(driver, pbp, ready=page_ready.pbp_page)
+
+    table = PbpTable.from_rows(parse_pbp_rows(pbp_html(driver), driver.current_url))
+
+    if pages is not None:
+        pages[key] = table
+    return table
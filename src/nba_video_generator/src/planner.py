@@ -0,0 +1,32 @@
+from types import ModuleType
+from selenium import webdriver
+from nba_video_generator.src import selenium_backend, tracing
+from nba_video_generator.src.schedule import game_dates
+
+
+@tracing.traced()
+def plan_games(driver: webdriver, players: list[tuple[str, str]],
+               date_start: str, date_end: str,
+               scraper: ModuleType = selenium_backend) -> list[tuple[str, str | None, list[int]]]:
+    """
+    Groups players (name, team) by game so each game is scraped once.
+
+    scraper is the backend module (selenium_backend or http_backend)
+    and driver its client.
+
+    Returns list ordered by date of date, box score link
+    (None if no game), and indices of players in the game.
+    """
+    games = {}
+    for i, (_, team) in enumerate(players):
+        for date in game_dates(team, date_start, date_end):
+            box_score = scraper.get_box_scores(driver, date, team)
+            if box_score not in games.setdefault(date, {}):
+                games[date][box_score] = []
+            games[date][box_score].append(i)
+
+    return [
+        (date, box_score, members)
+        for date in sorted(games)
+        for box_score, members in games[date].items()
+    ]
@@ -0,0 +1,86 @@
+class Play:
+    """
+    Immutable play: video url, description, period, and clock seconds
+    (None if unknown), with the lowered description and its flags
+    computed once.
+
+    Unpacks like the (url, desc, period, clock) tuple it replaces.
+    """
+
+    __slots__ = (
+        "url", "desc", "period", "clock", "desc_lower",
+        "is_free_throw", "is_foul", "is_off_foul", "is_timeout"
+    )
+
+    def __init__(self, url: str, desc: str, period, clock: int | None = None,
+                 desc_lower: str | None = None):
+        if desc_lower is None:
+            desc_lower = desc.lower()
+        set_slot = object.__setattr__
+        set_slot(self, "url", url)
+        set_slot(self, "desc", desc)
+        set_slot(self, "period", period_number(period))
+        set_slot(self, "clock", clock)
+        set_slot(self, "desc_lower", desc_lower)
+        set_slot(self, "is_free_throw", "free throw" in desc_lower)
+        set_slot(self, "is_foul", "foul" in desc_lower)
+        set_slot(self, "is_off_foul", "offensive foul" in desc_lower or "off. foul" in desc_lower)
+        set_slot(self, "is_timeout", "timeout" in desc_lower)
+
+    @classmethod
+    def of(cls, event) -> "Play":
+        """
+        Play from a Play or a (url, desc, period, clock) sequence (as read from a manifest).
+        """
+        if isinstance(event, cls):
+            return event
+        return cls(*event)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Play is immutable")
+
+    def __iter__(self):
+        return iter((self.url, self.desc, self.period, self.clock))
+
+    def __eq__(self, other):
+        if not isinstance(other, Play):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return "Play" + repr(tuple(self))
+
+    def __reduce__(self):
+        return Play, (self.url, self.desc, self.period, self.clock, self.desc_lower)
+
+    def with_url(self, url: str) -> "Play":
+        return Play(url, self.desc, self.period, self.clock, self.desc_lower)
+
+    def joined(self, other: "Play", clock: int | None) -> "Play":
+        """
+        Play merged with the following play other (its clip, both descriptions).
+        """
+        return Play(
+            other.url, self.desc + ", " + other.desc, self.period, clock,
+            self.desc_lower + ", " + other.desc_lower
+        )
+
+
+def period_number(period) -> int:
+    """
+    Period as int from 1, "1", "Q1", or "OT1" (5), 0 if unknown.
+    """
+    if isinstance(period, int):
+        return period
+    period = str(period).strip().upper()
+    if period.isdigit():
+        return int(period)
+    if period.startswith("OT"):
+        number = period[2:] or "1"
+        return 4 + int(number) if number.isdigit() else 0
+    if period.startswith("Q") and period[1:].isdigit():
+        return int(period[1:])
+    return 0
@@ -0,0 +1,439 @@
+"""
+Replay benchmark of the scrapers.
+
+Recorded nba.com, stats.nba.com and ESPN responses are served from a
+local HTTP server (one port per host) with optional latency and
+"content unavailable" pages, the scraper urls are pointed at it, and
+a fixed list of jobs is scraped while wall time, page loads,
+WebDriver commands and server requests are measured per stage.
+
+Replay is offline: Chrome resolves no host but the local servers, and
+scraper requests to other hosts fail. By default the small fixture set
+committed in replay_fixtures (one game) is replayed with its jobs.json;
+with record=True misses are fetched from the live site and saved to
+record_dir (or the given fixture directory).
+
+    python -m nba_video_generator.src.replay_bench -o results.json
+    python -m nba_video_generator.src.replay_bench jobs.json --record -o results.json
+
+Jobs are {"kind": "search", "player": ..., "team": ..., "date": ...,
+"stats": {"FGM": true, ...}, "include_ft": ..., "ft_source": ...} or
+{"kind": "beta", "last_name": ..., "team": ..., "date": ...}.
+Stage numbers are inclusive (a stage calling another counts both).
+"""
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import tempfile
+import threading
+from urllib.parse import urlparse
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from nba_video_generator import search, beta_search
+from nba_video_generator.src import \
+    get_box_scores, schedule, game_cache, fetch_policy, http_backend, selenium_backend
+from nba_video_generator.src.driver_factory import make_driver
+
+
+fixtures_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replay_fixtures")
+jobs_path = os.path.join(fixtures_dir, "jobs.json")
+# Fixture directory of recordings (record=True without a fixture directory).
+record_dir = os.path.join(os.path.expanduser("~"), ".nba_video_generator", "replay")
+
+hosts = ("www.nba.com", "stats.nba.com", "www.espn.com", "cdn.nba.com", "data.nba.com")
+
+# Module level urls pointed at the replay server.
+url_settings = [
+    (get_box_scores, "base_url"), (get_box_scores, "espn_url"),
+    (beta_search, "base_url"), (schedule, "current_schedule_url"),
+    (schedule, "season_schedule_url"), (schedule, "game_url"),
+    (http_backend, "nba_url"), (http_backend, "stats_url"),
+]
+
+# Stage name of each backend function (looked up on the backend module).
+backend_stages = {
+    "get_box_scores": "box_scores", "load_box_score": "box_score", "get_videos": "videos",
+    "sort_plays": "sort_plays", "get_ft_and_foul_videos": "ft_foul_videos",
+    "get_pbp": "pbp", "get_plays": "plays",
+}
+# Stage name of each function search calls directly.
+search_stages = {
+    "get_free_throws_or_fouls": "espn_game", "get_ft_and_foul_urls": "ft_foul_urls",
+    "get_ft_or_foul_videos": "ft_foul_videos",
+}
+
+unavailable_page = b"<html><body><h2>Content Unavailable</h2></body></html>"
+
+# Chrome switch failing name lookups of every host but the replay servers.
+offline_argument = "--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE 127.0.0.1"
+
+
+class ReplayServer:
+    """
+    Serves recorded responses of hosts, each on its own local port.
+
+    Responses are waited latency (plus up to jitter) seconds, and html
+    pages are replaced by an unavailable page with probability
+    unavailable_rate. With record, missing responses are fetched
+    from the live host and saved to fixture_dir.
+    """
+
+    def __init__(self, fixture_dir: str = fixtures_dir, record: bool = False,
+                 latency: float = 0.0, jitter: float = 0.0,
+                 unavailable_rate: float = 0.0, seed: int = 0):
+        self.fixture_dir = fixture_dir
+        self.record = record
+        self.latency = latency
+        self.jitter = jitter
+        self.unavailable_rate = unavailable_rate
+        self.requests = 0
+        self.misses = 0
+        self.origins = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._servers = []
+        self._index_path = os.path.join(fixture_dir, "index.json")
+        self.index = {}
+        if os.path.exists(self._index_path):
+            with open(self._index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+
+    def start(self) -> dict[str, str]:
+        """
+        Starts a server per host. Returns host to local origin.
+        """
+        for host in hosts:
+            server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self, host))
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self._servers.append(server)
+            self.origins[host] = "http://127.0.0.1:" + str(server.server_address[1])
+        return self.origins
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers.clear()
+
+    def respond(self, host: str, path: str) -> tuple[int, str, bytes]:
+        """
+        Status, content type, and body (local origins) of recorded path of host.
+        """
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            unavailable = self._random.random() < self.unavailable_rate
+        time.sleep(delay)
+
+        entry = self.index.get(host + path)
+        if entry is None and self.record:
+            entry = self._fetch(host, path)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return 404, "text/plain", b"not recorded: " + (host + path).encode("utf-8")
+
+        with open(os.path.join(self.fixture_dir, entry["file"]), "rb") as f:
+            body = f.read()
+        content_type = entry["content_type"]
+        if unavailable and content_type.startswith("text/html"):
+            return 200, content_type, unavailable_page
+        if content_type.startswith(("text/", "application/json", "application/javascript")):
+            for live_host, origin in self.origins.items():
+                body = body.replace(
+                    b"https://" + live_host.encode("ascii"), origin.encode("ascii")
+                )
+        return entry["status"], content_type, body
+
+    def _fetch(self, host: str, path: str) -> dict | None:
+        headers = dict(http_backend.headers)
+        if host == "stats.nba.com":
+            headers.update(http_backend.stats_headers)
+        try:
+            response = requests.get("https://" + host + path, headers=headers, timeout=30)
+        except requests.RequestException:
+            return None
+
+        name = hashlib.sha256((host + path).encode("utf-8")).hexdigest()[:24]
+        entry = {
+            "file": os.path.join(host, name), "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", "text/html")
+        }
+        os.makedirs(os.path.join(self.fixture_dir, host), exist_ok=True)
+        with open(os.path.join(self.fixture_dir, entry["file"]), "wb") as f:
+            f.write(response.content)
+
+        with self._lock:
+            self.index[host + path] = entry
+            temp_path = self._index_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.index, f, indent=1)
+            os.replace(temp_path, self._index_path)
+        return entry
+
+
+def _handler(server: ReplayServer, host: str):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, content_type, body = server.respond(host, self.path)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class Meter:
+    """
+    Calls, wall time, page loads, WebDriver commands, and server
+    requests, in total and per stage.
+    """
+
+    def __init__(self, server: ReplayServer | None = None):
+        self.server = server
+        self.page_loads = 0
+        self.commands = 0
+        self.stages = {}
+
+    def counts(self) -> dict:
+        return {
+            "wall": time.perf_counter(), "page_loads": self.page_loads,
+            "commands": self.commands,
+            "requests": self.server.requests if self.server is not None else 0,
+        }
+
+    def timed(self, stage: str, fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = self.counts()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(stage, start)
+        return wrapper
+
+    def add(self, stage: str, start: dict) -> None:
+        end = self.counts()
+        totals = self.stages.setdefault(
+            stage, {"calls": 0, "wall": 0.0, "page_loads": 0, "commands": 0, "requests": 0}
+        )
+        totals["calls"] += 1
+        for key, value in start.items():
+            totals[key] += end[key] - value
+
+    def count_driver(self, driver) -> None:
+        """
+        Counts WebDriver commands (and navigations) of driver.
+        """
+        execute = driver.execute
+
+        def counted(driver_command, params=None):
+            self.commands += 1
+            if driver_command == "get":
+                self.page_loads += 1
+            return execute(driver_command, params)
+
+        driver.execute = counted
+
+
+@contextmanager
+def _patched(settings: list[tuple[object, str, object]]):
+    saved = [(owner, name, getattr(owner, name)) for owner, name, _ in settings]
+    try:
+        for owner, name, value in settings:
+            setattr(owner, name, value)
+        yield
+    finally:
+        for owner, name, value in reversed(saved):
+            setattr(owner, name, value)
+
+
+def _replay_settings(origins: dict[str, str], meter: Meter, schedule_dir: str) -> list:
+    settings = []
+    for owner, name in url_settings:
+        value = getattr(owner, name)
+        for host, origin in origins.items():
+            value = value.replace("https://" + host, origin)
+        settings.append((owner, name, value))
+    settings += [
+        (game_cache, "use_cache", False), (schedule, "schedule_dir", schedule_dir),
+        (schedule, "_seasons", {}),
+    ]
+
+    get = fetch_policy.get
+
+    def counted_get(session, url, **kwargs):
+        if urlparse(url).hostname != "127.0.0.1":
+            raise fetch_policy.FetchError("Not a replay url (offline): " + url)
+        meter.page_loads += 1
+        return get(session, url, **kwargs)
+
+    settings.append((fetch_policy, "get", counted_get))
+
+    for backend in (selenium_backend, http_backend):
+        for name, stage in backend_stages.items():
+            if hasattr(backend, name):
+                settings.append((backend, name, meter.timed(stage, getattr(backend, name))))
+    for name, stage in search_stages.items():
+        settings.append((search, name, meter.timed(stage, getattr(search, name))))
+    return settings
+
+
+def run_job(job: dict, driver, backend: str = "selenium") -> None:
+    """
+    Scrapes job (no downloads or rendering).
+    """
+    if job["kind"] == "search":
+        search.generate_videos(
+            driver, [(job["player"], job["team"])], job["date"], job.get("date_end"),
+            include_ft=job.get("include_ft", False), backend=backend,
+            ft_source=job.get("ft_source", "espn"), **job.get("stats", {})
+        )
+    else:
+        scraper = beta_search.backends[backend]
+        client = driver if backend == "selenium" else http_backend.make_session()
+        data_is_home_team, pbp_url = scraper.get_pbp(
+            client, beta_search.base_url, job["date"], job["team"]
+        )
+        if pbp_url is not None:
+            scraper.get_plays(client, pbp_url, job["last_name"], data_is_home_team)
+
+
+def run(jobs: list[dict], fixture_dir: str | None = None, backend: str = "selenium",
+        record: bool = False, latency: float = 0.0, jitter: float = 0.0,
+        unavailable_rate: float = 0.0, seed: int = 0, headless: bool = True,
+        driver_options: dict | None = None) -> dict:
+    """
+    Scrapes jobs against the replay server.
+
+    Returns settings, per job and total wall time, page loads, WebDriver
+    commands, and server requests, with the same per stage. fixture_dir
+    defaults to record_dir when recording, else fixtures_dir.
+    """
+    if fixture_dir is None:
+        fixture_dir = record_dir if record else fixtures_dir
+    server = ReplayServer(fixture_dir, record, latency, jitter, unavailable_rate, seed)
+    origins = server.start()
+    driver = None
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as schedule_dir:
+            if backend == "selenium" or any(
+                job.get("include_ft") or job.get("stats", {}).get("PF") for job in jobs
+            ):
+                driver = make_driver(headless, **offline_options(driver_options))
+            for job in jobs:
+                meter = Meter(server)
+                if driver is not None:
+                    meter.count_driver(driver)
+                error = None
+                with _patched(_replay_settings(origins, meter, schedule_dir)):
+                    start = meter.counts()
+                    try:
+                        run_job(job, driver, backend)
+                    except Exception as e:
+                        error = type(e).__name__ + ": " + str(e)
+                    meter.add("total", start)
+                totals = meter.stages.pop("total")
+                totals.pop("calls")
+                results.append({"job": job, **totals, "stages": meter.stages, "error": error})
+                if driver is not None:
+                    del driver.execute
+    finally:
+        if driver is not None:
+            driver.quit()
+        server.stop()
+
+    return {
+        "settings": {
+            "backend": backend, "latency": latency, "jitter": jitter,
+            "unavailable_rate": unavailable_rate, "seed": seed, "headless": headless,
+        },
+        "jobs": results,
+        "stages": _sum_stages(results),
+        "misses": server.misses,
+    }
+
+
+def offline_options(driver_options: dict | None = None) -> dict:
+    """
+    driver_options for a Chrome session that only reaches the replay servers.
+    """
+    options = dict(driver_options or {})
+    options["arguments"] = tuple(options.get("arguments", ())) + (offline_argument,)
+    return options
+
+
+def _sum_stages(results: list[dict]) -> dict:
+    stages = {}
+    for result in results:
+        for stage, totals in result["stages"].items():
+            summed = stages.setdefault(stage, dict.fromkeys(totals, 0))
+            for key, value in totals.items():
+                summed[key] += value
+    return stages
+
+
+def compare(before: dict, after: dict) -> dict:
+    """
+    Change (after / before) of each stage total between two results.
+    """
+    changes = {}
+    for stage, totals in after["stages"].items():
+        old = before["stages"].get(stage)
+        if old is None:
+            continue
+        changes[stage] = {
+            key: (value / old[key] if old[key] else None) for key, value in totals.items()
+        }
+    return changes
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay benchmark of the scrapers.")
+    parser.add_argument("jobs", nargs="?", default=jobs_path,
+                        help="JSON file of jobs (default the committed fixture jobs)")
+    parser.add_argument("-o", "--output", help="results JSON file (default stdout)")
+    parser.add_argument("--fixtures", help="fixture directory (default the committed fixtures, "
+                        "or ~/.nba_video_generator/replay with --record)")
+    parser.add_argument("--backend", default="selenium", choices=["selenium", "http"])
+    parser.add_argument("--record", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--unavailable", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", help="earlier results JSON file to compare against")
+    args = parser.parse_args(argv)
+
+    with open(args.jobs, encoding="utf-8") as f:
+        jobs = json.load(f)
+
+    results = run(
+        jobs, args.fixtures, args.backend, args.record, args.latency,
+        args.jitter, args.unavailable, args.seed
+    )
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            results["compare"] = compare(json.load(f), results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+    else:
+        json.dump(results, sys.stdout, indent=1)
+
+
+if __name__ == "__main__":
+    main()
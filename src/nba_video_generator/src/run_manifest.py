@@ -0,0 +1,69 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from nba_video_generator.src import game_cache
+
+
+runs_dir = os.path.join(os.path.expanduser("~"), ".nba_video_generator", "runs")
+
+
+def job_path(kind: str, params: dict) -> str:
+    """
+    Manifest path of job kind ("search" or "beta") with params.
+    """
+    key = json.dumps(params, sort_keys=True, default=str)
+    return os.path.join(
+        runs_dir, kind + "_" + hashlib.sha256(key.encode("utf-8")).hexdigest()[:16] + ".json"
+    )
+
+
+class Manifest:
+    """
+    Progress of a run saved after each step so a rerun resumes where it stopped.
+
+    Sections map keys (dates, games, players) to scraped results,
+    downloaded clips, or encoded outputs. Entries of recent dates
+    (games may still change) expire after game_cache.recent_ttl.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.data = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def get(self, section: str, key: str, default=None, date: str | None = None):
+        """
+        Entry of key in section, default if missing or if date is recent
+        and the entry was stored more than game_cache.recent_ttl ago.
+        """
+        with self._lock:
+            if key not in self.data.get(section, {}):
+                return default
+            if date is not None and game_cache._is_recent(date):
+                stored = self.data.get("stored", {}).get(section, {}).get(key, 0)
+                if time.time() - stored > game_cache.recent_ttl:
+                    return default
+            return self.data[section][key]
+
+    def put(self, section: str, key: str, value) -> None:
+        with self._lock:
+            self.data.setdefault(section, {})[key] = value
+            self.data.setdefault("stored", {}).setdefault(section, {})[key] = time.time()
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                # Plays (and other iterable records) are stored as lists.
+                json.dump(self.data, f, default=list)
+            os.replace(temp_path, self.path)
+
+
+def files_exist(paths: list[str] | None) -> bool:
+    """
+    Whether recorded outputs are still on disk.
+    """
+    return paths is not None and all(os.path.exists(path) for path in paths)
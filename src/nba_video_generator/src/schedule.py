@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import urllib.request
+from datetime import datetime, timedelta
+from nba_video_generator.src import game_cache
+
+
+schedule_dir = os.path.join(os.path.expanduser("~"), ".nba_video_generator")
+current_schedule_url = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2.json"
+season_schedule_url = "https://data.nba.com/data/10s/v2015/json/mobile_teams/nba/{year}/league/00_full_schedule.json"
+game_url = "https://www.nba.com/game/{away}-vs-{home}-{game_id}/box-score"
+current_max_age = 24 * 60 * 60
+headers = {"User-Agent": "Mozilla/5.0", "Referer": "https://www.nba.com/"}
+
+_seasons = {}
+
+
+def season_of(date: str) -> int:
+    """
+    Returns starting year of the season date belongs to
+    (for example, 2025 for 2026-04-20).
+    """
+    year, month, _ = date.split("-")
+    if int(month) >= 8:
+        return int(year)
+    return int(year) - 1
+
+
+def game_dates(team: str, date_start: str, date_end: str) -> list[str]:
+    """
+    Returns dates (yyyy-mm-dd) between date_start and date_end
+    that team played.
+
+    Every date is returned for a season whose schedule cannot be loaded.
+    """
+    team = team.lower()
+    current_date = datetime.strptime(date_start, "%Y-%m-%d")
+    end_date = datetime.strptime(date_end, "%Y-%m-%d")
+
+    dates = []
+    while current_date <= end_date:
+        date = current_date.strftime("%Y-%m-%d")
+        index = load_season(season_of(date))
+        if index is None:
+            dates.append(date)
+        elif any(team in (game["home"], game["away"]) for game in index.get(date, [])):
+            dates.append(date)
+        current_date += timedelta(days=1)
+
+    return dates
+
+
+def team_off(team: str, date: str) -> bool:
+    """
+    Whether the schedule confirms team did not play on date
+    (False if the season schedule cannot be loaded).
+    """
+    index = load_season(season_of(date))
+    if index is None:
+        return False
+    team = team.lower()
+    return not any(team in (game["home"], game["away"]) for game in index.get(date, []))
+
+
+def load_season(season: int) -> dict[str, list[dict]] | None:
+    """
+    Loads schedule index of season from disk, fetching it if needed.
+
+    Output is dictionary with date as key and list of games
+    (game_id, home, away, box_score) as values.
+    """
+    if season in _seasons:
+        return _seasons[season]
+
+    path = os.path.join(schedule_dir, "schedule_" + str(season) + ".json")
+    is_current = season >= season_of(datetime.now().strftime("%Y-%m-%d"))
+
+    index = None
+    if os.path.exists(path) and \
+            (not is_current or time.time() - os.path.getmtime(path) < current_max_age):
+        with open(path, encoding="utf-8") as f:
+            index = json.load(f)
+        _seed_cache(index)
+    else:
+        try:
+            index = _fetch_season(season, is_current)
+        except Exception:
+            index = None
+        if index:
+            os.makedirs(schedule_dir, exist_ok=True)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(path + ".tmp", path)
+            _seed_cache(index)
+        else:
+            index = None
+
+    _seasons[season] = index
+    return index
+
+
+def _fetch_season(season: int, is_current: bool) -> dict[str, list[dict]]:
+    index = {}
+
+    if is_current:
+        data = _fetch_json(current_schedule_url)
+        for game_date in data["leagueSchedule"]["gameDates"]:
+            for game in game_date["games"]:
+                _add_game(
+                    index, game["gameDateEst"][:10], game["gameId"],
+                    game["homeTeam"]["teamTricode"], game["awayTeam"]["teamTricode"]
+                )
+        if index and season_of(min(index)) == season:
+            return index
+        index = {}
+
+    data = _fetch_json(season_schedule_url.format(year=season))
+    for month in data["lscd"]:
+        for game in month["mscd"]["g"]:
+            _add_game(index, game["gdte"], game["gid"], game["h"]["ta"], game["v"]["ta"])
+
+    return index
+
+
+def _fetch_json(url: str) -> dict:
+    request = urllib.request.Request(url, headers=headers)
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.load(response)
+
+
+def _add_game(index: dict, date: str, game_id: str, home: str, away: str) -> None:
+    if not home or not away:
+        return
+    home, away = home.lower(), away.lower()
+    index.setdefault(date, []).append({
+        "game_id": game_id,
+        "home": home,
+        "away": away,
+        "box_score": game_url.format(away=away, home=home, game_id=game_id)
+    })
+
+
+def _seed_cache(index: dict[str, list[dict]]) -> None:
+    """
+    Stores box score links in game cache so games pages are not loaded.
+    """
+    game_cache.store_many("nba", [
+        (date, team, game["box_score"])
+        for date, games in index.items()
+        for game in games
+        for team in (game["home"], game["away"])
+    ])
@@ -0,0 +1,13 @@
+"""
+Selenium scraping backend (WebDriver in place of session).
+"""
+from nba_video_generator.src.get_box_scores import get_box_scores
+from nba_video_generator.src.get_player_urls import load_box_score
+from nba_video_generator.src.get_videos import get_videos, sort_plays, get_ft_and_foul_videos
+from nba_video_generator.src.get_pbp_beta import get_pbp
+from nba_video_generator.src.get_plays_beta import get_plays
+
+__all__ = [
+    "get_box_scores", "load_box_score", "get_videos", "sort_plays",
+    "get_ft_and_foul_videos", "get_pbp", "get_plays",
+]
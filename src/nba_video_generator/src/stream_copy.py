@@ -0,0 +1,155 @@
+import os
+import subprocess
+import tempfile
+from fractions import Fraction
+import av
+from moviepy import TextClip
+from nba_video_generator.src import tracing
+
+
+# libx264 -profile:v value of each h264 profile name reported by probe.
+x264_profiles = {
+    "baseline": "baseline",
+    "constrained baseline": "baseline",
+    "main": "main",
+    "high": "high",
+    "high 10": "high10",
+    "high 10 intra": "high10",
+    "high 4:2:2": "high422",
+    "high 4:2:2 intra": "high422",
+    "high 4:4:4 predictive": "high444",
+    "high 4:4:4 intra": "high444",
+}
+
+
+def probe(path: str) -> dict | None:
+    """
+    Encoding parameters of clip that must match for a stream copy join.
+
+    Returns None if clip has no video.
+    """
+    with av.open(path) as container:
+        if not container.streams.video:
+            return None
+        video = container.streams.video[0]
+        params = {
+            "video_codec": video.codec_context.name,
+            "profile": video.codec_context.profile,
+            "pix_fmt": video.codec_context.pix_fmt,
+            "width": video.codec_context.width,
+            "height": video.codec_context.height,
+            "fps": str(video.average_rate),
+            "time_base": video.time_base.denominator,
+            "audio_codec": None,
+            "sample_rate": None,
+            "layout": None,
+        }
+        if container.streams.audio:
+            audio = container.streams.audio[0]
+            params["audio_codec"] = audio.codec_context.name
+            params["sample_rate"] = audio.codec_context.sample_rate
+            params["layout"] = audio.codec_context.layout.name
+        params["duration"] = container.duration / 1e6 if container.duration else 0
+    return params
+
+
+def uniform_params(paths: list[str]) -> tuple[dict | None, list[float]]:
+    """
+    Returns shared encoding parameters of clips (None if they differ
+    or are not h264/aac) and the duration of each clip.
+    """
+    shared = None
+    durations = []
+    for path in paths:
+        params = probe(path)
+        if params is None:
+            return None, []
+        durations.append(params.pop("duration"))
+        if shared is None:
+            shared = params
+        elif params != shared:
+            return None, []
+
+    if shared is None or shared["video_codec"] != "h264" or \
+            shared["audio_codec"] not in ("aac", None):
+        return None, []
+
+    return shared, durations
+
+
+@tracing.traced("title_card")
+def render_title_card(text: str, params: dict, path: str, ffmpeg_path: str,
+                      duration: float = 2, preset: str = "fast",
+                      font: str | None = None, font_size: int = 36) -> str:
+    """
+    Renders text card encoded like the clips so it can be stream copied.
+    """
+    width, height = params["width"], params["height"]
+    fd, image_path = tempfile.mkstemp(suffix=".png")
+    os.close(fd)
+    try:
+        TextClip(
+            text=text, font=font, font_size=font_size, color="white", bg_color="black",
+            size=(width, height), method="caption"
+        ).save_frame(image_path)
+
+        command = [
+            ffmpeg_path, "-y", "-loop", "1", "-framerate", params["fps"], "-t", str(duration),
+            "-i", image_path
+        ]
+        if params["audio_codec"] is not None:
+            command += [
+                "-f", "lavfi", "-t", str(duration), "-i",
+                "anullsrc=r=" + str(params["sample_rate"]) + ":cl=" + params["layout"]
+            ]
+        command += [
+            "-c:v", "libx264", "-preset", preset, "-pix_fmt", params["pix_fmt"],
+            "-s", str(width) + "x" + str(height), "-r", params["fps"]
+        ]
+        if params.get("time_base"):
+            command += ["-video_track_timescale", str(params["time_base"])]
+        profile = x264_profile(params["profile"])
+        if profile is not None:
+            command += ["-profile:v", profile]
+        if params["audio_codec"] is not None:
+            command += ["-c:a", "aac", "-ar", str(params["sample_rate"]), "-shortest"]
+        command += ["-movflags", "+faststart", path]
+        subprocess.run(command, check=True, capture_output=True)
+    finally:
+        os.remove(image_path)
+
+    return path
+
+
+def x264_profile(profile: str | None) -> str | None:
+    """
+    libx264 profile matching h264 profile name (None if it has none).
+    """
+    if not profile:
+        return None
+    return x264_profiles.get(profile.lower())
+
+
+@tracing.traced()
+def concat_copy(paths: list[str], output_path: str, ffmpeg_path: str) -> str:
+    """
+    Joins clips with the concat demuxer without re-encoding.
+    """
+    fd, list_path = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for path in paths:
+            safe_path = os.path.abspath(path).replace("\\", "/").replace("'", r"'\''")
+            f.write(f"file '{safe_path}'\n")
+    try:
+        subprocess.run([
+            ffmpeg_path, "-y", "-f", "concat", "-safe", "0", "-i", list_path,
+            "-c", "copy", "-movflags", "+faststart", output_path
+        ], check=True, capture_output=True)
+    finally:
+        os.remove(list_path)
+
+    return output_path
+
+
+def fps_value(params: dict) -> float:
+    return float(Fraction(params["fps"]))
@@ -0,0 +1,45 @@
+import os
+import json
+import uuid
+import hashlib
+from nba_video_generator.src.stream_copy import render_title_card
+
+
+cache_dir = os.path.join(os.path.expanduser("~"), ".nba_video_generator", "cards")
+
+
+def card_params(fps: int, width: int = 1280, height: int = 720) -> dict:
+    """
+    Encoding of cards for the re-encode path (h264 without audio).
+    """
+    return {
+        "video_codec": "h264", "profile": None, "pix_fmt": "yuv420p",
+        "width": width, "height": height, "fps": str(fps), "time_base": None,
+        "audio_codec": None, "sample_rate": None, "layout": None,
+    }
+
+
+def get_card(text: str, params: dict, ffmpeg_path: str, preset: str = "fast",
+             font: str | None = None, font_size: int = 36, duration: float = 2) -> str:
+    """
+    Returns path of title card with text encoded by params,
+    rendering it once per (text, size, font, fps, encoding).
+    """
+    key = json.dumps(
+        [text, font, font_size, duration, preset, sorted(params.items())], default=str
+    )
+    path = os.path.join(cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".mp4")
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # Unique temporary name so concurrent renders of the same card do not collide.
+    temp_path = os.path.join(cache_dir, uuid.uuid4().hex + ".tmp.mp4")
+    try:
+        render_title_card(text, params, temp_path, ffmpeg_path, duration, preset, font, font_size)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return path
@@ -0,0 +1,208 @@
+"""
+Stage level tracing of scraping and rendering.
+
+Nested spans (page loads, parsing, clip downloads, encodes) with
+attributes such as date, team, player and url are recorded while
+enabled, and exported as Chrome trace event JSON (chrome://tracing,
+Perfetto) or summarized per span name.
+
+Disabled (the default), span returns a shared no-op context and
+traced functions only check a flag.
+"""
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+
+enabled = False
+
+# Spans of this process (perf counter clock, shared by processes on Linux).
+_events = []
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_no_span = _NoSpan()
+
+
+class Span:
+    """
+    Span recorded as a complete event when it exits.
+
+    Attributes can be added while it runs with set.
+    """
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _events.append({
+            "name": self.name, "ph": "X", "ts": self.start / 1000,
+            "dur": (end - self.start) / 1000, "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {key: _value(value) for key, value in self.attrs.items()},
+        })
+        return False
+
+
+def _value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def span(name: str, **attrs):
+    """
+    Context manager timing a stage (no-op while disabled).
+    """
+    if not enabled:
+        return _no_span
+    return Span(name, attrs)
+
+
+def traced(name: str | None = None):
+    """
+    Decorator running the function in a span (named after it by default).
+    """
+    def decorator(fn):
+        span_name = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with Span(span_name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start() -> None:
+    """
+    Enables tracing, dropping spans recorded before.
+    """
+    global enabled
+    _events.clear()
+    enabled = True
+
+
+def stop() -> None:
+    global enabled
+    enabled = False
+
+
+def events() -> list[dict]:
+    return list(_events)
+
+
+def run_remote(trace: bool, fn, *args):
+    """
+    Runs fn(*args) in a worker process, tracing there if trace.
+
+    Returns result and the worker's spans, to be added with merge.
+    """
+    global enabled
+    enabled = trace
+    _events.clear()
+    result = fn(*args)
+    return result, events()
+
+
+def merge(remote_events: list[dict]) -> None:
+    _events.extend(remote_events)
+
+
+def export_chrome(path: str) -> None:
+    """
+    Writes spans as Chrome trace event JSON.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": _events, "displayTimeUnit": "ms"}, f)
+
+
+def summary() -> list[dict]:
+    """
+    Per span name: count, total, mean and max seconds, and self seconds
+    (total minus child spans), largest total first.
+    """
+    totals = {}
+    children = {}
+    for event in _events:
+        totals.setdefault(event["name"], []).append(event["dur"])
+
+    # Child time of each span, by containment on the same thread.
+    by_thread = {}
+    for event in _events:
+        by_thread.setdefault((event["pid"], event["tid"]), []).append(event)
+    for thread_events in by_thread.values():
+        thread_events.sort(key=lambda event: (event["ts"], -event["dur"]))
+        stack = []
+        for event in thread_events:
+            while stack and stack[-1]["ts"] + stack[-1]["dur"] <= event["ts"]:
+                stack.pop()
+            if stack:
+                parent = stack[-1]["name"]
+                children[parent] = children.get(parent, 0) + event["dur"]
+            stack.append(event)
+
+    rows = []
+    for name, durations in totals.items():
+        total = sum(durations) / 1e6
+        rows.append({
+            "name": name, "count": len(durations), "total": total,
+            "mean": total / len(durations), "max": max(durations) / 1e6,
+            "self": total - children.get(name, 0) / 1e6,
+        })
+    rows.sort(key=lambda row: row["total"], reverse=True)
+    return rows
+
+
+def format_summary() -> str:
+    lines = [f"{'span':<24} {'count':>6} {'total s':>9} {'self s':>9} {'mean s':>8} {'max s':>8}"]
+    for row in summary():
+        lines.append(
+            f"{row['name']:<24} {row['count']:>6} {row['total']:>9.2f} {row['self']:>9.2f} "
+            f"{row['mean']:>8.3f} {row['max']:>8.3f}"
+        )
+    return "\n".join(lines)
+
+
+@contextmanager
+def recording(path: str | None):
+    """
+    Traces the block if path is given, then writes the Chrome trace
+    to path and prints the summary.
+    """
+    if path is None:
+        yield
+        return
+    start()
+    try:
+        yield
+    finally:
+        stop()
+        export_chrome(path)
+        print(format_summary())
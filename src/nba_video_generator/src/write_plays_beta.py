@@ -2,40 +2,69 @@ import os
 import subprocess
 import time
 import av
+from nba_video_generator.src import clip_cache, encode_scheduler, tracing
 
 
+drawtext = "drawtext=textfile='{}':x=(w-text_w)/2:y=5:fontsize=18:fontcolor=white"
+drawbox = "drawbox=x=1070:y=0:w=210:h=40:color=black@1:t=fill"
+final_crf = "10"
+# Preset of the final quality encodes (None uses the caller's preset).
+final_preset = None
+
+
+@tracing.traced()
 def write_plays(title: str, base_name: str, date: str, player_urls: list[tuple[str, str]], ffmpeg_path: str, preset: str,
-                time_secs: float = 0, desc_txt = None):
+                time_secs: float = 0, desc_txt = None, single_pass: bool = True,
+                threads_per_job: int = 2):
+    """
+    single_pass applies caption and box to each clip at final quality
+    so the game is joined by stream copy. Otherwise clips are encoded
+    lossless and the game is re-encoded with the box. Encodes use
+    preset unless final_preset is set.
+
+    Clips are encoded concurrently within encode_scheduler.thread_budget.
+    """
     if desc_txt is None:
         desc_txt = open(title + " description.txt", "w+")
 
+    encode_preset = final_preset or preset
+    play_paths = []
+    text_paths = []
+    commands = []
     for i, (event_url, desc) in enumerate(player_urls):
         desc_txt.write(time.strftime('%H:%M:%S', time.gmtime(time_secs)) + " - " + desc + "\n")
-        with open("temp.txt", "w") as f:
+        play_name = base_name + "/" + base_name + "_" + date.replace("-", "") + "_play" + str(i)
+        # Relative name in working directory keeps the filter argument free of escapes.
+        text_path = "temp_" + str(os.getpid()) + "_" + str(i) + ".txt"
+        with open(text_path, "w") as f:
             f.write(desc)
-        subprocess.run([
-            ffmpeg_path, "-i", event_url, "-vf",
-            f"drawtext=textfile='temp.txt':x=(w-text_w)/2:y=5:fontsize=18:fontcolor=white",
-            "-c:v", "libx264", "-preset", preset, "-crf", "0", "-c:a", "copy", 
-            "-movflags", "+faststart", "-y",
-            base_name + "/" + base_name + "_" + date.replace("-", "") + "_play" + str(i) + ".mp4"
-        ], check=True)
+        text_paths.append(text_path)
+        caption = drawtext.format(text_path)
+        if single_pass:
+            encode = ["-vf", caption + "," + drawbox, "-crf", final_crf, "-preset", encode_preset]
+        else:
+            encode = ["-vf", caption, "-preset", preset, "-crf", "0"]
+        commands.append([
+            ffmpeg_path, "-i", event_url, *encode, "-c:v", "libx264", "-c:a", "copy",
+            "-movflags", "+faststart", "-y", play_name + ".mp4"
+        ])
+        play_paths.append(os.path.abspath(play_name + ".mp4"))
         with av.open(event_url) as container:
             time_secs += container.duration / 1e6
-        os.remove(event_url)
 
     try:
-        os.remove("temp.txt")
-    except Exception:
-        pass
-
-    files = [os.path.join(os.path.abspath(base_name), f) for f in os.listdir(base_name)]
+        encode_scheduler.run(commands, threads_per_job)
+    finally:
+        for text_path in text_paths:
+            os.remove(text_path)
 
-    files.sort(key=os.path.getctime)
+    for event_url, _ in player_urls:
+        if not clip_cache.is_cached_path(event_url):
+            os.remove(event_url)
 
     list_path = os.path.join(base_name, "file_list.txt")
     with open(list_path, "w", encoding="utf-8") as f:
-        for file_path in files:
+        for file_path in play_paths:
             safe_path = file_path.replace("\\", "/")
             safe_path = safe_path.replace("'", r"'\''")  # escape apostrophes
             f.write(f"file '{safe_path}'\n")
@@ -45,11 +74,14 @@ def write_plays(title: str, base_name: str, date: str, player_urls: list[tuple[s
     if os.path.exists(output_path):
         os.remove(output_path)
 
+    if single_pass:
+        encode = ["-c", "copy", "-movflags", "+faststart"]
+    else:
+        encode = ["-vf", drawbox, "-c:v", "libx264", "-crf", final_crf, "-preset", encode_preset, "-c:a", "copy"]
     subprocess.run(
         [
             ffmpeg_path, "-f", "concat", "-safe", "0", "-i", list_path,
-            "-vf", "drawbox=x=1070:y=0:w=210:h=40:color=black@1:t=fill", "-c:v", "libx264",
-            "-crf", "10", "-preset", "medium", "-c:a", "copy", output_path
+            *encode, output_path
         ], check=True
     )
 
@@ -0,0 +1,80 @@
+import re
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+
+
+class ClipHandler(BaseHTTPRequestHandler):
+    """
+    Serves server.files by path (with query, else without) with Range
+    support (unless server.ignore_range), recording
+    (method, path, Range header).
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self._serve(body=False)
+
+    def do_GET(self):
+        self._serve(body=True)
+
+    def _serve(self, body: bool):
+        self.server.requests.append((self.command, self.path, self.headers.get("Range")))
+        data = self.server.files.get(self.path, self.server.files.get(self.path.split("?")[0]))
+        if data is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        match = re.match(r"bytes=(\d+)-", self.headers.get("Range") or "")
+        if match is None or self.server.ignore_range:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+        else:
+            start = int(match.group(1))
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Range", "bytes */" + str(len(data)))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", "bytes " + str(start) + "-" + str(len(data) - 1) + "/" + str(len(data))
+            )
+            self.send_header("Content-Length", str(len(data) - start))
+            self.end_headers()
+            data = data[start:]
+        if body:
+            cut = self.server.truncate.pop(self.path, None)
+            if cut is not None:
+                # Connection dropped after cut bytes.
+                self.wfile.write(data[:cut])
+                self.wfile.flush()
+                self.close_connection = True
+                return
+            self.wfile.write(data)
+
+
+@pytest.fixture
+def clip_server():
+    """
+    Local page and clip server; set files (path to bytes), ignore_range,
+    and truncate (path to bytes sent before the next response to it is
+    cut off), url(path) is the full url of path.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ClipHandler)
+    server.files = {}
+    server.ignore_range = False
+    server.truncate = {}
+    server.requests = []
+    server.url = lambda path: "http://127.0.0.1:" + str(server.server_port) + path
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
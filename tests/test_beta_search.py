@@ -0,0 +1,79 @@
+from datetime import datetime
+from types import SimpleNamespace
+from nba_video_generator import beta_search
+from nba_video_generator.src import clip_cache, game_cache
+from nba_video_generator.src.run_manifest import Manifest
+
+
+def test_resume_reuses_downloaded_clips_without_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(clip_cache, "use_cache", False)
+    monkeypatch.setattr(beta_search, "game_dates", lambda team, start, end: [start])
+
+    clip = tmp_path / "tatum" / "20240101" / "0.mp4"
+    clip.parent.mkdir(parents=True)
+    clip.write_bytes(b"clip")
+    manifest_path = str(tmp_path / "run.json")
+    manifest = Manifest(manifest_path)
+    manifest.put("plays", "2024-01-01", ["BOS @ LAL", [["url", "Tatum Dunk", 1, 1]]])
+    manifest.put("clips", "2024-01-01", [[str(clip), "Tatum Dunk"]])
+
+    def download_plays(*args):
+        raise AssertionError("clips downloaded again")
+
+    written = []
+
+    def write_plays(title, base_name, date, player_urls, *args):
+        written.append([path for path, _ in player_urls])
+        assert clip.exists()
+        open(title + ".mp4", "wb").close()
+        return 5, None
+
+    monkeypatch.setattr(beta_search, "download_plays", download_plays)
+    monkeypatch.setattr(beta_search, "write_plays", write_plays)
+
+    beta_search.search(None, "Tatum", "2024-01-01", None, "bos", "ffmpeg",
+                       manifest_path=manifest_path)
+
+    assert written == [[str(clip)]]
+    assert Manifest(manifest_path).get("encodes", "2024-01-01")["secs"] == 5
+
+
+def test_recent_dates_are_scraped_again_once_stale(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(clip_cache, "use_cache", False)
+    monkeypatch.setattr(beta_search, "game_dates", lambda team, start, end: [start])
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    clip = tmp_path / "old.mp4"
+    clip.write_bytes(b"clip")
+    manifest_path = str(tmp_path / "run.json")
+    manifest = Manifest(manifest_path)
+    manifest.put("plays", today, ["BOS @ LAL", [["url", "Tatum Dunk", 1, 1]]])
+    manifest.put("clips", today, [[str(clip), "Tatum Dunk"]])
+    assert manifest.get("plays", today, date=today) is not None
+
+    # Stored longer than recent_ttl ago.
+    monkeypatch.setattr(game_cache, "recent_ttl", -1)
+    assert Manifest(manifest_path).get("plays", today, date=today) is None
+    assert Manifest(manifest_path).get("plays", today) is not None
+
+    plays = [["url", "Tatum Dunk", 1, 1], ["url2", "Tatum Layup", 2, 1]]
+    monkeypatch.setitem(beta_search.backends, "http", SimpleNamespace(
+        get_pbp=lambda *args: (True, "pbp"), get_plays=lambda *args: ["BOS @ LAL", plays]
+    ))
+    downloaded = []
+
+    def download_plays(driver, clips_dir, result):
+        downloaded.append(result)
+        return []
+
+    monkeypatch.setattr(beta_search, "download_plays", download_plays)
+    monkeypatch.setattr(beta_search, "write_plays",
+                        lambda title, *args: open(title + ".mp4", "wb").close() or (0, None))
+
+    beta_search.search(None, "Tatum", today, None, "bos", "ffmpeg", backend="http",
+                       manifest_path=manifest_path)
+
+    assert downloaded == [plays]
+    assert Manifest(manifest_path).get("plays", today)[1] == plays
@@ -0,0 +1,80 @@
+import os
+import time
+import threading
+from contextlib import closing
+import pytest
+from nba_video_generator.src import clip_cache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(clip_cache, "cache_dir", str(tmp_path / "clips"))
+    return tmp_path / "clips"
+
+
+def test_partial_download_resumes_by_url(cache, clip_server):
+    data = bytes(range(256)) * 40
+    clip_server.files["/a.mp4"] = data
+    url = clip_server.url("/a.mp4")
+
+    os.makedirs(cache)
+    with open(clip_cache._temp_path(url) + ".part", "wb") as f:
+        f.write(data[:1000])
+
+    path = clip_cache.get_clip(url)
+    assert open(path, "rb").read() == data
+    assert clip_server.requests == [("GET", "/a.mp4", "bytes=1000-")]
+    assert not any(name.endswith((".tmp", ".tmp.part")) for name in os.listdir(cache))
+
+    assert clip_cache.get_clip(url) == path
+    assert len(clip_server.requests) == 1
+
+
+def test_download_waits_for_lock_of_another_process(cache, clip_server):
+    fcntl = pytest.importorskip("fcntl")
+    clip_server.files["/a.mp4"] = b"a" * 1000
+    url = clip_server.url("/a.mp4")
+
+    os.makedirs(cache)
+    # A separate open file stands in for another process holding the lock.
+    with open(clip_cache._temp_path(url) + ".lock", "a+b") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        paths = []
+        waiter = threading.Thread(target=lambda: paths.append(clip_cache.get_clip(url)))
+        waiter.start()
+        time.sleep(0.3)
+        assert paths == [] and clip_server.requests == []
+        # The other process finishes the download before releasing the lock.
+        path = clip_cache._download(url, None)
+        fcntl.flock(lock, fcntl.LOCK_UN)
+    waiter.join(5)
+
+    assert paths == [path]
+    assert len(clip_server.requests) == 1
+
+
+def test_evict_sweeps_stale_partials_and_keeps_recent_clips(cache, clip_server, monkeypatch):
+    for name in ("old", "recent"):
+        clip_server.files["/" + name + ".mp4"] = name.encode() * 100
+    old = clip_cache.get_clip(clip_server.url("/old.mp4"))
+    recent = clip_cache.get_clip(clip_server.url("/recent.mp4"))
+
+    with closing(clip_cache._connect()) as conn:
+        with conn:
+            conn.execute("UPDATE clips SET last_used = ? WHERE url = ?",
+                         (time.time() - 2 * clip_cache.recent_secs, clip_server.url("/old.mp4")))
+
+    stale = cache / "stale.tmp.part"
+    fresh = cache / "fresh.tmp.part"
+    stale.write_bytes(b"x")
+    fresh.write_bytes(b"x")
+    past = time.time() - 2 * clip_cache.stale_secs
+    os.utime(stale, (past, past))
+
+    monkeypatch.setattr(clip_cache, "max_bytes", 0)
+    clip_cache.evict()
+
+    assert not os.path.exists(old)
+    assert os.path.exists(recent)
+    assert not stale.exists()
+    assert fresh.exists()
@@ -0,0 +1,77 @@
+import pytest
+from nba_video_generator.src import download_clips, fetch_policy
+from nba_video_generator.src.download_clips import download_clip
+from nba_video_generator.src.http_backend import make_session
+
+data = bytes(range(256)) * 64
+
+
+@pytest.fixture
+def clip(clip_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(fetch_policy, "backoff", lambda attempt: 0)
+    # Chunks smaller than the clip, as for real clips of several MB.
+    monkeypatch.setattr(download_clips, "chunk_size", 1024)
+    clip_server.files["/clip.mp4"] = data
+    return clip_server.url("/clip.mp4"), str(tmp_path / "clip.mp4")
+
+
+def test_resumes_partial_download_with_range(clip, clip_server):
+    url, path = clip
+    with open(path + ".part", "wb") as f:
+        f.write(data[:5000])
+
+    assert download_clip(make_session(), url, path) == path
+    assert open(path, "rb").read() == data
+    assert clip_server.requests == [("GET", "/clip.mp4", "bytes=5000-")]
+
+
+def test_complete_partial_is_kept_on_416(clip, clip_server):
+    url, path = clip
+    with open(path + ".part", "wb") as f:
+        f.write(data)
+
+    download_clip(make_session(), url, path)
+    assert open(path, "rb").read() == data
+    assert [method for method, _, _ in clip_server.requests] == ["GET", "HEAD"]
+
+
+def test_oversized_partial_is_downloaded_again(clip, clip_server):
+    url, path = clip
+    with open(path + ".part", "wb") as f:
+        f.write(data + b"extra")
+
+    download_clip(make_session(), url, path)
+    assert open(path, "rb").read() == data
+    assert clip_server.requests[-1] == ("GET", "/clip.mp4", None)
+
+
+def test_range_ignored_starts_over(clip, clip_server):
+    url, path = clip
+    clip_server.ignore_range = True
+    with open(path + ".part", "wb") as f:
+        f.write(b"\0" * 5000)
+
+    download_clip(make_session(), url, path)
+    assert open(path, "rb").read() == data
+    assert clip_server.requests == [("GET", "/clip.mp4", "bytes=5000-")]
+
+
+def test_dropped_connection_resumes_until_size_matches(clip, clip_server):
+    url, path = clip
+    clip_server.truncate["/clip.mp4"] = 3072
+
+    download_clip(make_session(), url, path)
+    assert open(path, "rb").read() == data
+    assert clip_server.requests == [
+        ("GET", "/clip.mp4", None), ("GET", "/clip.mp4", "bytes=3072-")
+    ]
+
+
+def test_gives_up_after_max_attempts(clip, clip_server, monkeypatch):
+    url, path = clip
+    monkeypatch.setattr(download_clips, "max_attempts", 1)
+    clip_server.truncate["/clip.mp4"] = 3072
+
+    with pytest.raises(Exception, match="Could not download"):
+        download_clip(make_session(), url, path)
+    assert open(path + ".part", "rb").read() == data[:3072]
@@ -0,0 +1,69 @@
+import pytest
+from nba_video_generator.src import driver_pool
+from nba_video_generator.src.driver_pool import DriverPool
+
+
+class FakeDriver:
+
+    def __init__(self):
+        self.crashed = False
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if self.crashed:
+            raise RuntimeError("session deleted")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def started(monkeypatch):
+    drivers = []
+
+    def make_driver(*args, **kwargs):
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    monkeypatch.setattr(driver_pool, "make_driver", make_driver)
+    return drivers
+
+
+def crash_first(pool, task):
+    with pool.driver() as driver:
+        if task == "crash" and len(crashed) == 0:
+            crashed.append(driver)
+            driver.crashed = True
+            raise RuntimeError("tab crashed")
+        return task, driver
+
+
+crashed = []
+
+
+@pytest.mark.parametrize("size", [1, 2])
+def test_map_retries_task_on_fresh_session_after_crash(started, size):
+    crashed.clear()
+    pool = DriverPool(size=size, max_rss=None)
+    results = pool.map(crash_first, ["a", "crash", "b"])
+
+    assert [task for task, _ in results] == ["a", "crash", "b"]
+    assert crashed[0].quit_called
+    assert results[1][1] is not crashed[0]
+    assert pool.recycled == 1
+    pool.close()
+
+
+def test_map_raises_task_errors_of_healthy_sessions(started):
+    def fail(pool, task):
+        with pool.driver():
+            calls.append(task)
+            raise ValueError(task)
+
+    calls = []
+    pool = DriverPool(size=1, max_rss=None)
+    with pytest.raises(ValueError):
+        pool.map(fail, ["a"])
+    assert calls == ["a"]
+    pool.close()
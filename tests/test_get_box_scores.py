@@ -0,0 +1,58 @@
+import pytest
+from nba_video_generator.src import get_box_scores, get_pbp_beta, game_cache, fetch_policy, schedule
+
+
+class NoGamesDriver:
+
+    def find_elements(self, by, value):
+        return []
+
+
+class NoGamesWait:
+
+    def __init__(self, driver, timeout):
+        pass
+
+    def until(self, condition):
+        return []
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(game_cache, "cache_path", str(tmp_path / "game_cache.sqlite"))
+    monkeypatch.setattr(schedule, "_seasons", {2023: None})
+
+
+def loaded(monkeypatch, state):
+    monkeypatch.setattr(fetch_policy, "load", lambda *args, **kwargs: state)
+
+
+def test_timeout_is_not_cached_as_no_game(cache, monkeypatch):
+    loaded(monkeypatch, "timeout")
+    assert get_box_scores.get_box_scores(NoGamesDriver(), "2024-01-10", "bos") is None
+    assert game_cache.lookup("nba", "2024-01-10", "bos") == (False, None)
+
+
+def test_ready_page_without_game_is_cached(cache, monkeypatch):
+    loaded(monkeypatch, "ready")
+    get_box_scores.get_box_scores(NoGamesDriver(), "2024-01-10", "bos")
+    assert game_cache.lookup("nba", "2024-01-10", "bos") == (True, None)
+
+
+def test_timeout_cached_when_schedule_confirms_no_game(cache, monkeypatch):
+    loaded(monkeypatch, "timeout")
+    monkeypatch.setattr(schedule, "_seasons", {2023: {"2024-01-10": [
+        {"game_id": "1", "home": "lal", "away": "den", "box_score": ""}
+    ]}})
+    get_box_scores.get_box_scores(NoGamesDriver(), "2024-01-10", "bos")
+    assert game_cache.lookup("nba", "2024-01-10", "bos") == (True, None)
+
+    get_box_scores.get_box_scores(NoGamesDriver(), "2024-01-10", "lal")
+    assert game_cache.lookup("nba", "2024-01-10", "lal") == (False, None)
+
+
+def test_beta_timeout_is_not_cached(cache, monkeypatch):
+    loaded(monkeypatch, "timeout")
+    monkeypatch.setattr(get_pbp_beta, "WebDriverWait", NoGamesWait)
+    assert get_pbp_beta.get_pbp(NoGamesDriver(), "", "2024-01-10", "bos") == (None, None)
+    assert game_cache.lookup("nba", "2024-01-10", "bos") == (False, None)
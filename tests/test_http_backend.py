@@ -0,0 +1,136 @@
+import json
+import pytest
+from nba_video_generator.src import http_backend, game_cache
+
+game_id = "0022400001"
+game_path = "/game/lal-vs-bos-" + game_id
+
+actions = [
+    {"actionNumber": 2, "period": 1, "clock": "PT12M00.00S", "description": "Period Start",
+     "teamTricode": ""},
+    {"actionNumber": 4, "period": 1, "clock": "PT11M30.00S", "teamTricode": "BOS",
+     "description": "Tatum 25' 3PT Jump Shot (3 PTS)"},
+    {"actionNumber": 6, "period": 1, "clock": "PT11M27.00S", "teamTricode": "BOS",
+     "description": "Tatum Driving Layup (5 PTS) (Brown 1 AST)"},
+    {"actionNumber": 7, "period": 1, "clock": "PT05M32.00S", "teamTricode": "LAL",
+     "description": "James S.FOUL (P1.T1) (K.Scott)"},
+    {"actionNumber": 8, "period": 1, "clock": "PT05M32.00S", "teamTricode": "BOS",
+     "description": "Tatum Free Throw 1 of 2 (6 PTS)"},
+    {"actionNumber": 30, "period": 2, "clock": "PT12M00.00S", "description": "Period Start",
+     "teamTricode": ""},
+    {"actionNumber": 31, "period": 2, "clock": "PT08M10.00S", "teamTricode": "BOS",
+     "description": "Tatum 25' 3PT Jump Shot (3 PTS)"},
+]
+
+box_score = {
+    "gameId": game_id,
+    "awayTeam": {"teamId": 1610612747, "teamTricode": "LAL", "players": []},
+    "homeTeam": {"teamId": 1610612738, "teamTricode": "BOS", "players": [{
+        "personId": 1628369, "firstName": "Jayson", "familyName": "Tatum",
+        "statistics": {"minutes": "PT36M12.00S", "fieldGoalsMade": 3, "fieldGoalsAttempted": 5},
+    }]},
+}
+
+
+def page(title: str, data: dict) -> bytes:
+    return (
+        "<html><head><title>" + title + "</title></head><body>"
+        '<script id="__NEXT_DATA__" type="application/json">' + json.dumps(data) +
+        "</script></body></html>"
+    ).encode("utf-8")
+
+
+def video_meta(urls: list[str]) -> dict:
+    return {"resultSets": {"Meta": {"videoUrls": [{"lurl": url} for url in urls]}}}
+
+
+@pytest.fixture
+def nba(clip_server, monkeypatch):
+    base = clip_server.url("")
+    monkeypatch.setattr(http_backend, "nba_url", base)
+    monkeypatch.setattr(http_backend, "stats_url", base + "/stats")
+    monkeypatch.setattr(game_cache, "use_cache", False)
+
+    files = clip_server.files
+    files["/games?date=2024-11-01"] = page("Games", {"props": {"pageProps": {"gameCardFeed": {
+        "modules": [{"cards": [{"cardData": {"gameId": game_id, "homeTeam": {"teamTricode": "BOS"},
+                                             "awayTeam": {"teamTricode": "LAL"}}}]}]
+    }}}})
+    files[game_path + "/box-score"] = page(
+        "LAL @ BOS Box Score | NBA.com", {"props": {"pageProps": {"game": box_score}}}
+    )
+    files[game_path + "/play-by-play?period=All"] = page(
+        "LAL @ BOS Play-by-Play | NBA.com",
+        {"props": {"pageProps": {"game": {"gameId": game_id}, "playByPlay": {"actions": actions}}}}
+    )
+    # Field goals in the order of the stats API (not game order), dsc as recorded.
+    files["/stats/videodetailsasset"] = json.dumps({"resultSets": {
+        "Meta": {"videoUrls": [
+            {"lurl": "https://videos.nba.com/31.mp4"}, {"lurl": "https://videos.nba.com/6.mp4"},
+            {"lurl": "https://videos.nba.com/4.mp4"},
+        ]},
+        "playlist": [
+            {"dsc": "Tatum 25' 3PT Jump Shot (3 PTS)", "p": 2},
+            {"dsc": "Tatum Driving Layup (5 PTS) (Brown 1 AST)", "p": 1},
+            {"dsc": "Tatum 25' 3PT Jump Shot (3 PTS)", "p": 1},
+        ],
+    }}).encode("utf-8")
+    for number in (4, 6, 7, 8, 31):
+        files["/stats/videoeventsasset?GameEventID=" + str(number) + "&GameID=" + game_id] = \
+            json.dumps(video_meta(["https://videos.nba.com/" + str(number) + ".mp4"])).encode()
+    return clip_server
+
+
+def test_box_score_videos_sorted_by_play_by_play(nba):
+    session = http_backend.make_session()
+
+    box = http_backend.get_box_scores(session, "2024-11-01", "bos")
+    assert box == nba.url(game_path + "/box-score")
+
+    title, players = http_backend.load_box_score(session, box, ["Jayson Tatum"], [3])
+    assert title == "LAL @ BOS"
+    cells, urls = players["Jayson Tatum"]
+    assert cells[:4] == ["Jayson Tatum", "36:12", "3", "5"]
+    assert [td for td, _ in urls] == [3]
+
+    video_urls = http_backend.get_videos(session, urls[0][1])
+    method, path, _ = nba.requests[-1]
+    assert path.startswith("/stats/videodetailsasset?") and "ContextMeasure=FGM" in path
+    assert "flag=" not in path
+
+    plays = http_backend.sort_plays(session, box, video_urls, {})
+    # Each dsc is matched to its action (the second three to the second),
+    # and the layup 3 seconds after the first three is joined with it.
+    assert [(play.url, play.period, play.clock, play.desc) for play in plays] == [
+        ("https://videos.nba.com/6.mp4", 1, 687,
+         "Tatum 25' 3PT Jump Shot (3 PTS), Tatum Driving Layup (5 PTS) (Brown 1 AST)"),
+        ("https://videos.nba.com/31.mp4", 2, 490, "Tatum 25' 3PT Jump Shot (3 PTS)"),
+    ]
+
+
+def test_plays_and_free_throws_from_page_data(nba):
+    session = http_backend.make_session()
+    pbp = nba.url(game_path + "/play-by-play?period=All")
+
+    title, plays = http_backend.get_plays(session, pbp, "Tatum", "true")
+    assert title == "Tatum LAL @ BOS Full Play"
+    # Foul drawn before the free throw is added, the three and layup are one clip.
+    assert [play.url for play in plays] == [
+        "https://videos.nba.com/6.mp4", "https://videos.nba.com/7.mp4",
+        "https://videos.nba.com/8.mp4", "https://videos.nba.com/31.mp4",
+    ]
+
+    video_urls = http_backend.get_ft_and_foul_videos(
+        session, pbp, "Jayson Tatum", "bos", include_fouls=False
+    )
+    assert {desc: [play.url for play in videos] for desc, videos in video_urls.items()} == {
+        "james s.foul (p1.t1) (k.scott)": ["https://videos.nba.com/7.mp4"],
+        "tatum free throw 1 of 2 (6 pts)": ["https://videos.nba.com/8.mp4"],
+    }
+
+
+def test_sub_minute_clocks_round_like_the_page():
+    assert http_backend._clock("PT00M04.20S") == "0:04"
+    assert http_backend._clock("PT00M04.70S") == "0:05"
+    assert http_backend._clock("PT00M59.70S") == "1:00"
+    assert http_backend._secs("PT11M42.00S") == 702
@@ -0,0 +1,108 @@
+import os
+import re
+from nba_video_generator.src.parse_pages import \
+    parse_pbp_rows, parse_box_score_rows, parse_espn_rows
+from nba_video_generator.src.pbp_table import PbpTable
+from nba_video_generator.src.get_videos import sort_pbp_rows
+from nba_video_generator.src.get_player_urls import _espn_time, _match_urls
+from nba_video_generator.src.play import Play
+
+pages_dir = os.path.join(os.path.dirname(__file__), "pages")
+pbp_url = "https://www.nba.com/game/lal-vs-bos-0022400001/play-by-play?period=All"
+
+
+def page(name: str) -> str:
+    with open(os.path.join(pages_dir, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_parse_pbp_rows():
+    rows = parse_pbp_rows(page("nba_pbp.html"), pbp_url)
+
+    assert len(rows) == 9
+    assert rows[1] == {
+        "desc": "Tatum 25' 3PT Jump Shot (3 PTS)", "time": "11:30",
+        "url": "https://www.nba.com/stats/events?CFID=&CFPARAMS=&GameEventID=4"
+               "&GameID=0022400001&flag=1",
+        "text": "11:30\nTatum 25' 3PT Jump Shot (3 PTS)\n3 - 0\nVideo available",
+        "home": "true", "period": 1,
+    }
+    assert rows[0]["url"] is None
+    assert [row["time"] for row in rows[2:7]] == ["5:32", "5:32", "5:32", "5:33", "0:04.2"]
+    assert [row["home"] for row in rows[2:4]] == ["false", "true"]
+    assert [row["period"] for row in rows] == [1] * 7 + [2] * 2
+
+
+def test_period_headers_set_row_periods():
+    def article(time, desc):
+        return (
+            '<article data-is-home-team="true"><span class="GamePlayByPlayRow_clockElement">' +
+            time + '</span><span class="GamePlayByPlayRow_desc">' + desc + "</span></article>"
+        )
+
+    html = (
+        '<div id="playByPlayContainer">'
+        '<div class="GamePlayByPlay_period__x"><span>Q1</span></div>' + article("0:20", "a") +
+        '<div class="GamePlayByPlay_period__x"><span>Q2</span></div>'
+        '<div class="GamePlayByPlay_period__x"><span>Q3</span></div>' + article("0:30", "b") +
+        '<div class="GamePlayByPlay_period__x"><span>OT1</span></div>' + article("4:50", "c") +
+        "</div>"
+    )
+    rows = parse_pbp_rows(html)
+    assert [(row["desc"], row["period"]) for row in rows] == [("a", 1), ("b", 3), ("c", 5)]
+    assert [play.period for play in PbpTable.from_rows(rows).plays] == [1, 3, 5]
+
+
+def test_hidden_text_does_not_change_matching():
+    html = page("nba_pbp.html")
+    visible_html = re.sub(r'<span[^>]*display:none[^>]*>[^<]*</span>', "", html)
+    assert visible_html != html
+
+    table = PbpTable.from_rows(parse_pbp_rows(html, pbp_url))
+    visible = PbpTable.from_rows(parse_pbp_rows(visible_html, pbp_url))
+
+    for name in ("Tatum", "James", "Brown"):
+        assert table.player_rows(name) == visible.player_rows(name)
+        for home in ("true", "false"):
+            assert table.foul_rows(name, home) == visible.foul_rows(name, home)
+            assert table.free_throw_rows(name, home) == visible.free_throw_rows(name, home)
+    assert table.free_throw_rows("Tatum", "true") == [2, 3, 4]
+    assert table.foul_rows("James", "false") == [2]
+    assert table.foul_rows("Tatum", "true") == []
+    assert [play.period for play in table.plays] == [1] * 7 + [2] * 2
+
+
+def test_sub_minute_play_is_sorted_and_matched():
+    table = PbpTable.from_rows(parse_pbp_rows(page("nba_pbp.html"), pbp_url))
+    desc = "brown p.foul (p1.t2) (t.brothers)"
+    assert table.plays[table.find(desc)[0]].clock == 4
+
+    plays = sort_pbp_rows(table, {desc: [Play("https://videos.nba.com/40.mp4", desc, 1)]})
+    assert [(play.url, play.period, play.clock) for play in plays] == \
+        [("https://videos.nba.com/40.mp4", 1, 4)]
+
+    espn_row = parse_espn_rows(page("espn_pbp.html"))[4]
+    urls = _match_urls(table, {"Q1": [_espn_time(espn_row)]}, lambda text: ".FOUL" in text)
+    assert urls == [(table.plays[6].url, "1")]
+
+
+def test_parse_box_score_rows():
+    rows = parse_box_score_rows(page("nba_box_score.html"), "https://www.nba.com/game/x/box-score")
+
+    assert [name for name, _, _ in rows] == ["Jayson Tatum", "Jaylen Brown"]
+    name, cells, links = rows[0]
+    assert cells[1:] == ["36:12", "11", "21", ".524"]
+    assert links[3].endswith("PlayerID=1628369&ContextMeasure=FGM")
+    assert links[4].endswith("PlayerID=1628369&ContextMeasure=FGA")
+    assert 5 not in links
+    assert rows[1][1][1:] == ["DNP - Coach's Decision"]
+
+
+def test_parse_espn_rows():
+    rows = parse_espn_rows(page("espn_pbp.html"))
+
+    assert rows[2:] == [
+        "5:32 LeBron James shooting foul (Jayson Tatum draws the foul) 0 3",
+        "5:32 Jayson Tatum makes free throw 1 of 2 0 4",
+        "4.2 Jaylen Brown personal foul 12 15",
+    ]
@@ -0,0 +1,34 @@
+from nba_video_generator.src.pbp_table import PbpTable
+
+
+def row(time: str, desc: str, period: int | None = None) -> dict:
+    return {"desc": desc, "time": time, "url": None, "text": desc, "home": "true", "period": period}
+
+
+def test_period_of_each_row():
+    table = PbpTable.from_rows([
+        row("12:00", "Period Start", 1),
+        row("5:32", "Tatum S.FOUL (P1.T1)", 1),
+        row("5:33", "Instant Replay (Clock Adjustment)", 1),
+        row("12:00", "Period Start", 1),
+        row("1:00", "Brown Free Throw 1 of 2 (1 PTS)", 3),
+        row("4:10", "Brown Driving Layup (2 PTS)", 5),
+    ])
+    assert [play.period for play in table.plays] == [1, 1, 1, 1, 3, 5]
+    assert table.at(1, 333) == [2]
+    assert table.at(5, 250) == [5]
+
+
+def test_explicit_period():
+    table = PbpTable.from_rows([row("1:00", "a", 2), row("12:00", "b")], 3)
+    assert [play.period for play in table.plays] == [3, 3]
+
+
+def test_rows_without_period():
+    table = PbpTable.from_rows([row("1:00", "a"), row("12:00", "b")])
+    assert [play.period for play in table.plays] == [1, 1]
+
+
+def test_sub_minute_clock():
+    table = PbpTable.from_rows([row("0:04.2", "a", 1), row("0:59.7", "b", 1)])
+    assert [play.clock for play in table.plays] == [4, 60]
@@ -0,0 +1,55 @@
+import json
+import pytest
+from nba_video_generator.src import replay_bench, fetch_policy
+from nba_video_generator.src.driver_factory import make_driver
+
+game_path = "/game/lal-vs-bos-0022400001/play-by-play"
+job = {"kind": "beta", "last_name": "Tatum", "team": "bos", "date": "2025-01-10"}
+
+
+def test_http_replay():
+    results = replay_bench.run([job], backend="http")
+
+    assert results["misses"] == 0
+    result = results["jobs"][0]
+    assert result["error"] is None
+    assert result["stages"]["plays"]["requests"] == 4
+    assert result["page_loads"] == 5
+
+
+def test_default_jobs_replay_committed_fixtures(tmp_path):
+    output = tmp_path / "results.json"
+    replay_bench.main(["--backend", "http", "-o", str(output)])
+
+    results = json.loads(output.read_text(encoding="utf-8"))
+    assert [result["job"] for result in results["jobs"]] == [job]
+    assert results["misses"] == 0 and results["jobs"][0]["error"] is None
+
+
+def test_scraper_requests_stay_on_replay_servers():
+    settings = replay_bench._replay_settings(
+        {host: "http://127.0.0.1:1" for host in replay_bench.hosts}, replay_bench.Meter(), ""
+    )
+    get = next(value for owner, name, value in settings if owner is fetch_policy and name == "get")
+    with pytest.raises(fetch_policy.FetchError):
+        get(None, "https://cdn.example.com/app.js")
+
+
+def test_chrome_replay_is_offline():
+    try:
+        driver = make_driver(True, **replay_bench.offline_options())
+    except Exception as e:
+        pytest.skip("Chrome not available: " + type(e).__name__)
+
+    server = replay_bench.ReplayServer()
+    origins = server.start()
+    try:
+        driver.get(origins["www.nba.com"] + game_path)
+        assert driver.title == "LAL @ BOS Play-by-Play | NBA.com"
+
+        driver.get("https://www.example.com/")
+        assert "ERR_NAME_NOT_RESOLVED" in driver.page_source
+        assert server.misses == 0
+    finally:
+        driver.quit()
+        server.stop()
@@ -0,0 +1,64 @@
+from datetime import datetime
+from nba_video_generator import search
+from nba_video_generator.src import game_cache
+
+
+def test_render_workers_fork_only_on_linux(monkeypatch):
+    monkeypatch.setattr(search.sys, "platform", "win32")
+    assert search._fork_context() is None
+    monkeypatch.setattr(search.sys, "platform", "darwin")
+    assert search._fork_context() is None
+    monkeypatch.setattr(search.sys, "platform", "linux")
+    assert search._fork_context().get_start_method() == "fork"
+
+
+def test_pipeline_leaves_params_and_keys_job_by_scrape_params(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(search, "job_path", lambda kind, params: recorded.append(params) or
+                        str(tmp_path / "run.json"))
+    monkeypatch.setattr(search, "generate_videos", lambda **params: [("Title", [""], {})])
+    monkeypatch.setattr(search, "make_video", lambda **params: [])
+    monkeypatch.setattr(search, "combine_videos", lambda *args: None)
+    recorded = []
+
+    player_params = {"date_start": "2024-01-01", "AST": False}
+    video_params = {"ffmpeg_path": "ffmpeg"}
+    search.pipeline(player_params, video_params, [("Tatum", "bos", "tatum")], resume=False)
+
+    assert player_params == {"date_start": "2024-01-01", "AST": False}
+    assert video_params == {"ffmpeg_path": "ffmpeg"}
+    assert recorded == [{
+        "date_start": "2024-01-01", "date_end": "2024-01-01", "AST": False,
+        "players": [("Tatum", "bos")], "backend": "selenium",
+    }]
+
+
+class Pool:
+    def __init__(self, **kwargs):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_pipeline_scrapes_and_renders_recent_dates_again_once_stale(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scrapes = []
+    renders = []
+    monkeypatch.setattr(search, "generate_videos",
+                        lambda **params: scrapes.append(1) or [("Title", [""], {})])
+    monkeypatch.setattr(search, "make_video", lambda **params: renders.append(1) or [])
+    monkeypatch.setattr(search, "combine_videos", lambda *args: None)
+    monkeypatch.setattr(search, "DriverPool", Pool)
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    manifest_path = str(tmp_path / "run.json")
+    for _ in range(2):
+        search.pipeline({"date_start": today}, {"ffmpeg_path": "ffmpeg"},
+                        [("Tatum", "bos", "tatum")], manifest_path=manifest_path)
+    assert len(scrapes) == len(renders) == 1
+
+    monkeypatch.setattr(game_cache, "recent_ttl", -1)
+    search.pipeline({"date_start": today}, {"ffmpeg_path": "ffmpeg"},
+                    [("Tatum", "bos", "tatum")], manifest_path=manifest_path)
+    assert len(scrapes) == len(renders) == 2
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import pytest
+from nba_video_generator import search
+from nba_video_generator.src import stream_copy, title_cards, clip_cache
+from nba_video_generator.src.play import Play
+
+imageio_ffmpeg = pytest.importorskip("imageio_ffmpeg")
+
+
+def make_clip(path: str, profile: str) -> str:
+    subprocess.run([
+        imageio_ffmpeg.get_ffmpeg_exe(), "-y", "-f", "lavfi", "-i", "testsrc=size=320x180:rate=30",
+        "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=44100", "-t", "1",
+        "-c:v", "libx264", "-profile:v", profile, "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-shortest", path
+    ], check=True, capture_output=True)
+    return path
+
+
+def test_x264_profile():
+    assert stream_copy.x264_profile("Constrained Baseline") == "baseline"
+    assert stream_copy.x264_profile("High 4:4:4 Predictive") == "high444"
+    assert stream_copy.x264_profile("Extended") is None
+    assert stream_copy.x264_profile(None) is None
+
+
+def test_card_matches_constrained_baseline_clip(tmp_path):
+    clip = make_clip(str(tmp_path / "clip.mp4"), "baseline")
+    params = stream_copy.probe(clip)
+    assert params["profile"] == "Constrained Baseline"
+    params.pop("duration")
+
+    card = stream_copy.render_title_card(
+        "2024-01-01", params, str(tmp_path / "card.mp4"), imageio_ffmpeg.get_ffmpeg_exe(),
+        duration=1
+    )
+    card_params = stream_copy.probe(card)
+    card_params.pop("duration")
+    assert card_params == params
+
+
+def test_make_video_falls_back_when_copy_fails(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(clip_cache, "use_cache", False)
+    clip = make_clip(str(tmp_path / "clip.mp4"), "main")
+
+    def failing_card(*args, **kwargs):
+        raise subprocess.CalledProcessError(1, "ffmpeg")
+
+    rendered = []
+
+    def segments(video_urls, base_name, *args):
+        rendered.append(base_name)
+        return [os.path.abspath(base_name + ".mp4")]
+
+    monkeypatch.setattr(title_cards, "get_card", failing_card)
+    monkeypatch.setattr(search, "_make_video_segments", segments)
+
+    outputs = search.make_video(
+        {"2024-01-01": [Play(clip, "Tatum 3PT Jump Shot", 1)]}, "video",
+        ffmpeg_path=imageio_ffmpeg.get_ffmpeg_exe()
+    )
+    assert rendered == ["video"]
+    assert outputs == [os.path.abspath("video.mp4")]
+    assert open("video_description.txt").read() == ""
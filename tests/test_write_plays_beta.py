@@ -0,0 +1,56 @@
+import io
+import pytest
+from nba_video_generator.src import write_plays_beta, encode_scheduler, clip_cache
+
+
+class Container:
+    duration = 2_000_000
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+@pytest.fixture
+def commands(tmp_path, monkeypatch):
+    """
+    ffmpeg commands of write_plays, clip encodes then the join.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "game").mkdir()
+    run = []
+    monkeypatch.setattr(encode_scheduler, "run", lambda commands, threads: run.extend(commands))
+    monkeypatch.setattr(write_plays_beta.subprocess, "run", lambda command, check: run.append(command))
+    monkeypatch.setattr(write_plays_beta.av, "open", lambda url: Container())
+    monkeypatch.setattr(clip_cache, "is_cached_path", lambda path: True)
+    return run
+
+
+def preset_of(command: list[str]) -> str | None:
+    return command[command.index("-preset") + 1] if "-preset" in command else None
+
+
+def plays() -> list[tuple[str, str]]:
+    return [("a.mp4", "Tatum 3PT Jump Shot"), ("b.mp4", "Tatum Layup")]
+
+
+@pytest.mark.parametrize("single_pass", [True, False])
+def test_encodes_use_caller_preset(commands, single_pass):
+    time_secs, _ = write_plays_beta.write_plays(
+        "title", "game", "2025-01-10", plays(), "ffmpeg", "veryfast",
+        desc_txt=io.StringIO(), single_pass=single_pass
+    )
+    assert time_secs == 4
+    assert [preset_of(command) for command in commands] == \
+        ["veryfast", "veryfast", None if single_pass else "veryfast"]
+
+
+def test_final_preset_overrides(commands, monkeypatch):
+    monkeypatch.setattr(write_plays_beta, "final_preset", "slow")
+    write_plays_beta.write_plays(
+        "title", "game", "2025-01-10", plays(), "ffmpeg", "veryfast",
+        desc_txt=io.StringIO(), single_pass=False
+    )
+    assert [preset_of(command) for command in commands] == ["veryfast", "veryfast", "slow"]